@@ -0,0 +1,73 @@
+"""
+Compare the structure-aware markup splitter with the old render round-trip
+(markdown -> HTML -> BeautifulSoup.get_text) on the same documents.
+
+Usage:
+    python benchmarks/markup_benchmark.py [file.md|file.html ...]
+
+Without arguments a synthetic docs-site page is generated. Only the text
+extraction/splitting step is timed; tokenization is the same for both paths.
+"""
+
+import sys
+import time
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from the_chunker.chunking.markup_chunker import split_html, split_markdown  # noqa: E402
+
+try:
+    import markdown
+    from bs4 import BeautifulSoup
+    HAS_ROUND_TRIP = True
+except ImportError:
+    HAS_ROUND_TRIP = False
+
+
+def synthetic_markdown(sections=2000):
+    parts = []
+    for i in range(sections):
+        parts.append(f"## Section {i}\n\nSome *prose* with a [link](https://example.com/{i}) and `inline code`.\n\n")
+        parts.append("- item one\n- item two\n\n")
+        parts.append(f"```python\ndef handler_{i}(event):\n    return event['id']\n```\n\n")
+    return "# Docs\n\n" + "".join(parts)
+
+
+def best_of(fn, text, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def round_trip_markdown(text):
+    return BeautifulSoup(markdown.markdown(text), "html.parser").get_text()
+
+
+def round_trip_html(text):
+    return BeautifulSoup(text, "html.parser").get_text()
+
+
+def main(paths):
+    docs = [(p, pathlib.Path(p).read_text(encoding="utf-8", errors="ignore")) for p in paths]
+    if not docs:
+        docs = [("synthetic.md", synthetic_markdown())]
+
+    for name, text in docs:
+        is_markdown = pathlib.Path(name).suffix.lower() in (".md", ".markdown", ".mdown", ".mkd")
+        split = split_markdown if is_markdown else split_html
+        spans = split(text)
+        print(f"{name}: {len(text) / 1024:.0f} KiB, {len(spans)} sections")
+        print(f"  structure-aware split: {best_of(split, text) * 1000:8.1f} ms")
+        if HAS_ROUND_TRIP:
+            round_trip = round_trip_markdown if is_markdown else round_trip_html
+            print(f"  render round-trip:     {best_of(round_trip, text) * 1000:8.1f} ms")
+        else:
+            print("  render round-trip:     skipped (markdown/beautifulsoup4 not installed)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
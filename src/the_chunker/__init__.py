@@ -1 +1,6 @@
-from .chunker import turn_file_to_chunks
+from .chunker import turn_file_to_chunks, turn_file_to_chunks_for_models
+from .chunking import FileBudget
+from .git_chunker import turn_git_diff_to_chunks
+from .archive_chunker import turn_archive_to_chunks
+from .pipeline import ChunkingPipeline
+from .profiler import profile_files, profile_directory
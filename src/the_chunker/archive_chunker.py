@@ -0,0 +1,148 @@
+"""
+Chunk files directly inside .zip / .tar(.gz|.bz2|.xz) archives.
+Members are streamed into memory one by one and routed by extension exactly
+like files on disk, so nothing is extracted to a scratch directory.
+"""
+
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .chunking import chunk_bytes
+from .chunking.read_file_content import is_readable_name
+from .chunking.token_cache import get_token_cache
+from .my_overlap_chunker import merge_with_overlap
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def _read_member(member, budget) -> bytes:
+    """Read a member; with a budget at most max_bytes + 1 bytes, so chunk_bytes still sees it is oversized."""
+    max_bytes = budget.max_bytes if budget is not None else None
+    if max_bytes is None:
+        return member.read()
+    return member.read(max_bytes + 1)
+
+
+def iter_archive_members(archive_path: str, budget=None) -> Iterator[Tuple[Optional[str], bytes, Optional[str]]]:
+    """
+    Yield (member_name, data, error) for every regular file in the archive whose
+    extension the readers support. Tar archives are read as a single stream.
+    With a FileBudget, members are inflated only up to max_bytes + 1 bytes
+    (the header size is not trusted), so one bomb cannot fill memory.
+    A member that cannot be read (bad CRC, encrypted, truncated) is yielded with
+    empty data and an error message; if the archive stream itself breaks, a last
+    entry with member_name None carries the error and iteration stops.
+    """
+    lowered = archive_path.lower()
+    if lowered.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not is_readable_name(info.filename):
+                    continue
+                try:
+                    with zf.open(info) as member:
+                        data = _read_member(member, budget)
+                except Exception as e:
+                    yield info.filename, b"", f"{type(e).__name__}: {e}"
+                    continue
+                yield info.filename, data, None
+    elif lowered.endswith(TAR_SUFFIXES):
+        with tarfile.open(archive_path, "r|*") as tf:
+            members = iter(tf)
+            while True:
+                try:
+                    info = next(members)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    yield None, b"", f"{type(e).__name__}: {e}"
+                    return
+                if not info.isreg() or not is_readable_name(info.name):
+                    continue
+                try:
+                    member = tf.extractfile(info)
+                    data = _read_member(member, budget) if member is not None else None
+                except Exception as e:
+                    yield info.name, b"", f"{type(e).__name__}: {e}"
+                    continue
+                if data is not None:
+                    yield info.name, data, None
+    else:
+        raise ValueError(f"Unsupported archive format: {archive_path}")
+
+
+def _chunk_member(data: bytes, member_name: str, model_name: str, debug_level: str,
+                  budget=None) -> Tuple[List[Dict], List[Dict]]:
+    """Chunk one member; returns (final_chunks, budget events recorded for it)."""
+    events_before = len(budget.events) if budget is not None else 0
+    semantic_chunks = chunk_bytes(data, member_name, model_name, debug_level, budget)
+    final_chunks = merge_with_overlap(semantic_chunks) if semantic_chunks else []
+    return final_chunks, budget.events[events_before:] if budget is not None else []
+
+
+def _chunk_member_in_worker(*args) -> Tuple[List[Dict], List[Dict]]:
+    """_chunk_member for pool workers, which exit without atexit: persist new token counts per member."""
+    try:
+        return _chunk_member(*args)
+    finally:
+        cache = get_token_cache()
+        if cache is not None:
+            cache.flush()
+
+
+def turn_archive_to_chunks(archive_path: str, debug_level: str = "NONE",
+                           model_name: str = "Qwen/Qwen3-Embedding-8B", workers: int = 1,
+                           budget=None) -> List[Dict]:
+    """
+    Chunk every supported member of an archive without extracting it.
+    With workers > 1 members are spread over a process pool; at most
+    2 * workers members are held in memory at once.
+    budget is an optional FileBudget applied to every member (events from pool
+    workers are collected into it as well).
+    Final chunks are tagged with 'archive' and 'member'.
+    Returns [{'archive', 'member', 'chunks'}, ...] in archive order; a member
+    that could not be read or chunked has empty chunks and an 'error' message
+    (member None when the archive stream itself is corrupt).
+    """
+    results = []
+
+    def record(member_name, outcome, error=None):
+        if error is None:
+            try:
+                final_chunks, events = outcome()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            print(f"[ERROR] Could not chunk {archive_path}:{member_name}: {error}")
+            results.append({"archive": archive_path, "member": member_name, "chunks": [], "error": error})
+            return
+        if budget is not None and workers > 1:
+            for event in events:
+                budget._record(event)
+        chunks = [dict(chunk, archive=archive_path, member=member_name) for chunk in final_chunks]
+        results.append({"archive": archive_path, "member": member_name, "chunks": chunks})
+        if debug_level == "VERBOSE":
+            print(f"[INFO] {archive_path}:{member_name}: {len(chunks)} final chunks")
+
+    if workers <= 1:
+        for member_name, data, error in iter_archive_members(archive_path, budget):
+            record(member_name, lambda: _chunk_member(data, member_name, model_name, debug_level, budget), error)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for member_name, data, error in iter_archive_members(archive_path, budget):
+            future = None if error is not None else \
+                pool.submit(_chunk_member_in_worker, data, member_name, model_name, debug_level, budget)
+            in_flight.append((member_name, future, error))
+            if len(in_flight) >= 2 * workers:
+                name, future, error = in_flight.popleft()
+                record(name, future and future.result, error)
+        while in_flight:
+            name, future, error = in_flight.popleft()
+            record(name, future and future.result, error)
+
+    return results
@@ -1,12 +1,13 @@
 import os
-from .chunking import chunk_file  # <- uses dispatcher logic
+from .chunking import chunk_file, chunk_file_for_models  # <- uses dispatcher logic
 from .my_overlap_chunker import merge_with_overlap
 from typing import List, Dict
 
 
-def turn_file_to_chunks(input_file, debug_level="NONE", model_name="Qwen/Qwen3-Embedding-8B"):
+def turn_file_to_chunks(input_file, debug_level="NONE", model_name="Qwen/Qwen3-Embedding-8B", budget=None):
     # 1. Use dispatcher to get semantic chunks (tree-sitter or fallback)
-    semantic_chunks = chunk_file(input_file, model_name, debug_level)
+    # budget: optional FileBudget bounding time/memory spent on this file
+    semantic_chunks = chunk_file(input_file, model_name, debug_level, budget)
     if not semantic_chunks:
         print(f"[WARN] No blocks found in {input_file}")
         return
@@ -68,3 +69,24 @@ def turn_file_to_chunks(input_file, debug_level="NONE", model_name="Qwen/Qwen3-E
                     print(f"\n[INFO] {len(above_range)} chunks above 800 tokens (single large semantic chunks)")
     
     return final_chunks
+
+
+def turn_file_to_chunks_for_models(input_file, model_names, debug_level="NONE", budget=None):
+    """
+    Like turn_file_to_chunks, but for several embedding models at once.
+    The file is read and parsed a single time and the same semantic spans are
+    merged separately per model, since each model counts tokens differently.
+    Returns {model_name: final_chunks}.
+    """
+    semantic_chunks_per_model = chunk_file_for_models(input_file, model_names, debug_level, budget)
+    if not any(semantic_chunks_per_model.values()):
+        print(f"[WARN] No blocks found in {input_file}")
+        return {}
+
+    final_chunks_per_model = {}
+    for model_name, semantic_chunks in semantic_chunks_per_model.items():
+        final_chunks_per_model[model_name] = merge_with_overlap(semantic_chunks)
+        if debug_level == "VERBOSE":
+            print(f"[INFO] {model_name}: {len(semantic_chunks)} semantic chunks -> "
+                  f"{len(final_chunks_per_model[model_name])} final chunks")
+    return final_chunks_per_model
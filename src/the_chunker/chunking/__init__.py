@@ -1,2 +1,3 @@
-from .dispatcher import chunk_file
-
+from .dispatcher import chunk_file, chunk_bytes, chunk_file_for_models
+from .budget import FileBudget, BudgetExceeded
+from .profiles import resolve_profile, override_language, map_extension
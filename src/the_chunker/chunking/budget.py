@@ -0,0 +1,112 @@
+"""
+Per-file time and memory budgets.
+A FileBudget holds the limits for a run; chunk_file starts a BudgetTracker for
+each file and the stages check it cooperatively:
+
+- read: oversized files are truncated (text) or skipped (binary documents),
+  slow document extraction is cut off at the deadline
+- ast: tree-sitter extraction past ast_share of the time budget (or over
+  max_ast_bytes) degrades to the fallback chunker
+- fallback: token counting stops at the deadline and the chunks so far are kept;
+  oversized tree-sitter and markup spans are split under the same deadlines
+
+Since the AST stage only gets ast_share of max_seconds, a degraded file still
+has time left for the fallback and the whole file stays within max_seconds.
+
+The memory budget is expressed as bytes of source held per file, which is what
+the readers, tree-sitter and the fallback chunker scale with.
+Every degradation is printed and appended to FileBudget.events.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a stage when the file ran out of its time budget."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"time budget exceeded during {stage}")
+        self.stage = stage
+
+
+class FileBudget:
+    """
+    Limits applied to every file of a run.
+    max_seconds:   wall-clock budget per file (read + chunk)
+    max_bytes:     largest file read in full; bigger text files are truncated, binary documents skipped
+    max_ast_bytes: largest source handed to tree-sitter; bigger files go straight to the fallback chunker
+    ast_share:     fraction of max_seconds (from the file's start) tree-sitter extraction may use
+    """
+
+    def __init__(self, max_seconds: Optional[float] = None, max_bytes: Optional[int] = None,
+                 max_ast_bytes: Optional[int] = None, ast_share: float = 0.5):
+        self.max_seconds = max_seconds
+        self.ast_share = ast_share
+        self.max_bytes = max_bytes
+        self.max_ast_bytes = max_ast_bytes
+        self.events = []  # [{'file', 'stage', 'action', 'reason'}, ...]
+        self._lock = threading.Lock()
+
+    def start(self, file_path: str) -> "BudgetTracker":
+        """Start the clock for one file."""
+        return BudgetTracker(self, file_path)
+
+    def __getstate__(self):
+        # Sent to pool workers: limits only; each worker keeps its own event log
+        state = dict(self.__dict__, events=[])
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _record(self, event: dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+
+class BudgetTracker:
+    """Budget state for a single file; create with FileBudget.start()."""
+
+    def __init__(self, budget: FileBudget, file_path: str):
+        self.budget = budget
+        self.file_path = file_path
+        self.deadline = None
+        self.ast_deadline = None
+        self._paused_at = None
+        if budget.max_seconds is not None:
+            started = time.monotonic()
+            self.deadline = started + budget.max_seconds
+            self.ast_deadline = started + budget.max_seconds * budget.ast_share
+
+    def pause(self) -> None:
+        """Stop the clock, e.g. while the file waits in a queue between stages."""
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+
+    def resume(self) -> None:
+        """Restart the clock; the paused time does not count against the file."""
+        if self._paused_at is None:
+            return
+        waited = time.monotonic() - self._paused_at
+        self._paused_at = None
+        if self.deadline is not None:
+            self.deadline += waited
+            self.ast_deadline += waited
+
+    def expired(self, stage: Optional[str] = None) -> bool:
+        deadline = self.ast_deadline if stage == "ast" else self.deadline
+        return deadline is not None and time.monotonic() > deadline
+
+    def check(self, stage: str) -> None:
+        """Raise BudgetExceeded if the stage's deadline has passed."""
+        if self.expired(stage):
+            raise BudgetExceeded(stage)
+
+    def record(self, stage: str, action: str, reason: str) -> None:
+        """Record a degradation ('truncated', 'skipped' or 'fallback')."""
+        print(f"[WARN] {self.file_path}: {action} during {stage} ({reason})")
+        self.budget._record({"file": self.file_path, "stage": stage, "action": action, "reason": reason})
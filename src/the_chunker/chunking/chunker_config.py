@@ -1,4 +1,6 @@
 # chunker_config.py
+import os
+
 # === Node types to extract per language (Tree-sitter based) ===
 # Updated to match actual tree-sitter-languages package node types
 LANG_FUNCTION_NODES = {
@@ -238,6 +240,19 @@ EXT_TO_LANG = {
     ".properties": "default",
 }
 
+# === Markup formats chunked from source structure (see markup_chunker.py) ===
+# These skip the render-to-text round-trip in read_file_content and tree-sitter.
+MARKUP_EXTENSIONS = {
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".mdown": "markdown",
+    ".mkd": "markdown",
+    ".html": "html",
+    ".htm": "html",
+    ".xhtml": "html",
+    ".xml": "xml",
+}
+
 # === Languages that can be chunked semantically using Tree-sitter ===
 # Updated to match what's actually available in tree-sitter-languages
 CHUNKABLE_LANGUAGES = {
@@ -281,8 +296,6 @@ CHUNKABLE_LANGUAGES = {
 # === Helper functions ===
 def get_language_from_extension(file_path: str) -> str:
     """Get language identifier from file path/extension."""
-    import os
-    
     # Handle special cases first (exact filename matches)
     filename = os.path.basename(file_path)
     if filename in EXT_TO_LANG:
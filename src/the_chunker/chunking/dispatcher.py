@@ -1,23 +1,28 @@
 # dispatcher.py
 import os
-from .chunker_config import get_language_from_extension, is_chunkable
-from .tree_chunker import extract_code_blocks
+from .profiles import resolve_profile
+from .tree_chunker import extract_code_spans, tokenize_code_spans
 from .fallback_chunker import fallback_chunk
-from .read_file_content import read_file_content 
+from .markup_chunker import split_markup, tokenize_markup_spans
+from .read_file_content import read_file_content, read_bytes_content
+from .tokenizer import count_tokens
+from .budget import BudgetExceeded
 
 
-def chunk_file(file_path: str, model_name: str, debug_level : str) -> list[dict]:
+def chunk_file(file_path: str, model_name: str, debug_level : str, budget=None) -> list[dict]:
     """
     Main entry point for chunking files.
     Returns list of dictionaries with 'content' and 'tokens' keys.
+    Pass a FileBudget to bound the time and memory spent on this file.
     """
-    # Use the centralized language resolution from config
-    language = get_language_from_extension(file_path)
+    tracker = budget.start(file_path) if budget is not None else None
+    # One lookup resolves language, reader and markup format (see profiles.py)
+    profile = resolve_profile(file_path)
     if debug_level == "VERBOSE":
-        print(f"[INFO] Identified language: {language} for file: {os.path.basename(file_path)}")
+        print(f"[INFO] Identified language: {profile.language.name} for file: {os.path.basename(file_path)}")
     
     try:
-        content = read_file_content(file_path)
+        content = read_file_content(file_path, tracker, reader=profile.reader) if profile.reader else ""
         
         if content == "":
             print("[INFO] File is empty")
@@ -27,21 +32,119 @@ def chunk_file(file_path: str, model_name: str, debug_level : str) -> list[dict]
         print(f"[ERROR] Could not read file {file_path}: {e}")
         return []
     
-    if is_chunkable(language):
+    return _chunk_content(content, profile, model_name, debug_level, tracker)
+
+
+def chunk_bytes(data: bytes, file_name: str, model_name: str, debug_level: str, budget=None) -> list[dict]:
+    """
+    Chunk in-memory file bytes (git blobs, archive members) without touching the filesystem.
+    file_name is only used to pick the reader and language, like the path in chunk_file.
+    Pass a FileBudget to bound the time and memory spent on this data.
+    Returns list of dictionaries with 'content' and 'tokens' keys.
+    """
+    tracker = budget.start(file_name) if budget is not None else None
+    profile = resolve_profile(file_name)
+    if debug_level == "VERBOSE":
+        print(f"[INFO] Identified language: {profile.language.name} for file: {os.path.basename(file_name)}")
+
+    content = read_bytes_content(data, file_name, tracker, reader=profile.reader) if profile.reader else ""
+    if content == "":
         if debug_level == "VERBOSE":
-            print(f"[INFO] Using tree-sitter chunking for {language}")
-        try:
-            code_blocks = extract_code_blocks(content, language, model_name, debug_level)
-            if code_blocks == []:
-                if debug_level=="VERBOSE":
-                    print("[INFO] No code blocks were extracted from file, using fallback strategy instead")
-                return fallback_chunk(content, model_name)
-            return code_blocks
-        except Exception as e:
-            print(f"[WARNING] Tree-sitter chunking failed for {language}: {e}")
-            print(f"[INFO] Falling back to basic chunking")
-            return fallback_chunk(content, model_name)
-    else:
+            print(f"[INFO] No readable content in {file_name}")
+        return []
+
+    return _chunk_content(content, profile, model_name, debug_level, tracker)
+
+
+def chunk_file_for_models(file_path: str, model_names: list[str], debug_level: str,
+                          budget=None) -> dict[str, list[dict]]:
+    """
+    Chunk a file once for several models.
+    The file is read and parsed a single time; semantic spans are decided with the
+    first model and then token-counted for every model.
+    Returns {model_name: [{'content', 'tokens'}, ...]} with the same spans per model.
+    """
+    if not model_names:
+        return {}
+
+    primary_model = model_names[0]
+    blocks = chunk_file(file_path, primary_model, debug_level, budget)
+
+    result = {primary_model: blocks}
+    for model_name in model_names[1:]:
+        result[model_name] = [
+            dict(block, tokens=count_tokens(block["content"], model_name))
+            for block in blocks
+        ]
+    return result
+
+
+def _chunk_content(content: str, profile, model_name: str, debug_level: str, tracker=None) -> list[dict]:
+    """Pick markup, tree-sitter or fallback chunking for already-read content."""
+    spans = parse_content(content, profile, debug_level, tracker)
+    return tokenize_content(content, spans, profile, model_name, debug_level, tracker)
+
+
+def parse_content(content: str, profile, debug_level: str, tracker=None):
+    """
+    Parse stage: markup sections for Markdown/HTML/XML source, tree-sitter spans
+    for chunkable languages. profile is the FileProfile from resolve_profile().
+    Returns a list of spans, or None when the content should go to the
+    fallback chunker instead.
+    """
+    if profile.markup is not None:
+        if debug_level == "VERBOSE":
+            print(f"[INFO] Using structure-aware {profile.markup} chunking")
+        return split_markup(content, profile.markup) or None
+
+    language = profile.language.name
+    if not profile.language.chunkable:
         if debug_level == "VERBOSE":
             print(f"[INFO] Using fallback chunking for {language}")
-        return fallback_chunk(content, model_name)
+        return None
+
+    max_ast_bytes = tracker.budget.max_ast_bytes if tracker is not None else None
+    if max_ast_bytes is not None and len(content.encode("utf-8")) > max_ast_bytes:
+        tracker.record("ast", "fallback", f"source larger than {max_ast_bytes} bytes")
+        return None
+
+    if debug_level == "VERBOSE":
+        print(f"[INFO] Using tree-sitter chunking for {language}")
+    try:
+        spans = extract_code_spans(content, language, debug_level, tracker)
+    except BudgetExceeded as e:
+        tracker.record("ast", "fallback", str(e))
+        return None
+    except Exception as e:
+        print(f"[WARNING] Tree-sitter chunking failed for {language}: {e}")
+        print(f"[INFO] Falling back to basic chunking")
+        return None
+
+    if spans == []:
+        if debug_level=="VERBOSE":
+            print("[INFO] No code blocks were extracted from file, using fallback strategy instead")
+        return None
+    return spans
+
+
+def tokenize_content(content: str, spans, profile, model_name: str, debug_level: str, tracker=None) -> list[dict]:
+    """
+    Tokenize stage: count tokens for parsed spans, or fallback-chunk the whole
+    content when spans is None.
+    Returns list of dictionaries with 'content' and 'tokens' keys
+    (plus 'heading_path' for markup).
+    """
+    if spans is None:
+        return fallback_chunk(content, model_name, tracker)
+    max_span_tokens = profile.language.max_span_tokens
+    if profile.markup is not None:
+        return tokenize_markup_spans(spans, model_name, debug_level, tracker, max_span_tokens)
+    try:
+        return tokenize_code_spans(spans, model_name, debug_level, tracker, max_span_tokens)
+    except BudgetExceeded as e:
+        tracker.record("ast", "fallback", str(e))
+        return fallback_chunk(content, model_name, tracker)
+    except Exception as e:
+        print(f"[WARNING] Tree-sitter chunking failed: {e}")
+        print(f"[INFO] Falling back to basic chunking")
+        return fallback_chunk(content, model_name, tracker)
@@ -6,11 +6,19 @@ MAX_CHUNKING_SIZE = 400  # Target token size per chunk
 
 _chunker = RecursiveChunker(chunk_size=MAX_CHUNKING_SIZE)
 
-def fallback_chunk(file_text: str, model_name: str) -> List[dict]:
+def fallback_chunk(file_text: str, model_name: str, tracker=None, stage: str = "fallback") -> List[dict]:
+    """
+    Split text with the recursive chunker and count tokens per chunk.
+    With a BudgetTracker, stops at the stage's deadline and keeps the chunks so far
+    (stage 'ast' when splitting an oversized tree-sitter span).
+    """
     chunks = _chunker(file_text)
     
     result = []
     for c in chunks:
+        if tracker is not None and tracker.expired(stage):
+            tracker.record(stage, "truncated", f"time budget exceeded after {len(result)} chunks")
+            break
         text = c.text  # preserve as-is: no strip, no whitespace removal
 
         if text.strip():  # only skip completely empty chunks (e.g. whitespace-only)
@@ -0,0 +1,226 @@
+"""
+Structure-aware chunking for Markdown and HTML/XML.
+Splits the source in a single pass on headings, sections and code blocks
+instead of rendering Markdown to HTML and flattening it with BeautifulSoup,
+so heading structure survives as 'heading_path' metadata on every chunk.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List
+
+from .fallback_chunker import fallback_chunk
+from .profiles import DEFAULT_MAX_SPAN_TOKENS
+from .tokenizer import count_tokens
+
+
+_ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_SETEXT_UNDERLINE = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+
+_HTML_SKIP_TAGS = {"script", "style", "noscript", "template"}
+_HTML_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_HTML_BLOCK_TAGS = {
+    "p", "div", "section", "article", "aside", "header", "footer", "nav", "main",
+    "li", "ul", "ol", "dl", "dt", "dd", "tr", "table", "blockquote", "br", "hr", "figure",
+}
+
+
+def _push_heading(path: list, level: int, title: str) -> None:
+    while path and path[-1][0] >= level:
+        path.pop()
+    path.append((level, title))
+
+
+def _span(content: str, path: list, kind: str) -> dict:
+    return {"content": content, "heading_path": [title for _, title in path], "kind": kind}
+
+
+def split_markdown(text: str) -> List[dict]:
+    """
+    Split Markdown source into sections and fenced code blocks.
+    Each span keeps its source text (heading line included) and the titles of
+    the headings it sits under. Returns [{'content', 'heading_path', 'kind'}, ...]
+    with kind 'text', 'code' or 'front_matter' (a leading YAML block).
+    """
+    spans = []
+    path = []
+    buf = []
+    fence = None  # (char, length) of the open code fence
+
+    def flush():
+        if buf and "".join(buf).strip():
+            spans.append(_span("".join(buf), path, "text"))
+        buf.clear()
+
+    lines = text.splitlines(keepends=True)
+    # YAML front matter: '---' on the first line up to the closing '---' / '...'.
+    # Handled up front so its closing line is not read as a setext underline.
+    if lines and lines[0].rstrip() == "---":
+        for end in range(1, len(lines)):
+            if lines[end].rstrip() in ("---", "..."):
+                spans.append(_span("".join(lines[:end + 1]), path, "front_matter"))
+                lines = lines[end + 1:]
+                break
+
+    for line in lines:
+        if fence is not None:
+            buf.append(line)
+            stripped = line.strip()
+            if stripped and set(stripped) == {fence[0]} and len(stripped) >= fence[1]:
+                spans.append(_span("".join(buf), path, "code"))
+                buf.clear()
+                fence = None
+            continue
+
+        m = _FENCE.match(line)
+        if m:
+            flush()
+            fence = (m.group(1)[0], len(m.group(1)))
+            buf.append(line)
+            continue
+
+        m = _ATX_HEADING.match(line)
+        if m:
+            flush()
+            _push_heading(path, len(m.group(1)), (m.group(2) or "").strip())
+            buf.append(line)
+            continue
+
+        m = _SETEXT_UNDERLINE.match(line)
+        if m and buf and buf[-1].strip() and not _ATX_HEADING.match(buf[-1]) \
+                and not buf[-1].lstrip().startswith(("-", "*", "+", ">", "|")):
+            title_line = buf.pop()
+            flush()
+            _push_heading(path, 1 if m.group(1)[0] == "=" else 2, title_line.strip())
+            buf.extend([title_line, line])
+            continue
+
+        buf.append(line)
+
+    # An unclosed fence runs to the end of the document
+    if fence is not None:
+        spans.append(_span("".join(buf), path, "code"))
+        buf.clear()
+    flush()
+    return spans
+
+
+class _HTMLSplitter(HTMLParser):
+    """Streams HTML/XML events into heading-delimited text spans and <pre> code spans."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.spans = []
+        self.path = []
+        self.buf = []
+        self.skip_depth = 0
+        self.heading = None  # (level, [text parts]) while inside <hN>
+        self.pre = None      # [text parts] while inside <pre>
+
+    def flush(self):
+        text = "".join(self.buf)
+        if text.strip():
+            self.spans.append(_span(text, self.path, "text"))
+        self.buf = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HTML_SKIP_TAGS:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            return
+        elif tag in _HTML_HEADINGS and self.pre is None:
+            self.flush()
+            self.heading = (_HTML_HEADINGS[tag], [])
+        elif tag == "pre" and self.heading is None:
+            self.flush()
+            self.pre = []
+        elif tag in _HTML_BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif self.skip_depth:
+            return
+        elif tag in _HTML_HEADINGS and self.heading is not None:
+            level, parts = self.heading
+            self.heading = None
+            title = " ".join("".join(parts).split())
+            _push_heading(self.path, level, title)
+            self.buf.append(title + "\n\n")
+        elif tag == "pre" and self.pre is not None:
+            code = "".join(self.pre)
+            self.pre = None
+            if code.strip():
+                self.spans.append(_span(code, self.path, "code"))
+        elif tag in _HTML_BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.heading is not None:
+            self.heading[1].append(data)
+        elif self.pre is not None:
+            self.pre.append(data)
+        else:
+            self.buf.append(data)
+
+    def unknown_decl(self, data):
+        if data.startswith("CDATA["):
+            self.handle_data(data[len("CDATA["):])
+
+    def _newline(self):
+        if self.pre is None and self.heading is None and self.buf and not self.buf[-1].endswith("\n"):
+            self.buf.append("\n")
+
+
+def split_html(text: str) -> List[dict]:
+    """
+    Split HTML (or XML) source into heading-delimited sections and <pre> blocks
+    with a streaming parser; no document tree is built.
+    Returns [{'content', 'heading_path', 'kind'}, ...] with kind 'text' or 'code'.
+    """
+    splitter = _HTMLSplitter()
+    splitter.feed(text)
+    splitter.close()
+    if splitter.heading is not None:
+        splitter.buf.extend(splitter.heading[1])
+    if splitter.pre is not None:
+        splitter.buf.extend(splitter.pre)
+    splitter.flush()
+    return splitter.spans
+
+
+def split_markup(text: str, markup_format: str) -> List[dict]:
+    """Dispatch to the splitter for 'markdown', 'html' or 'xml'."""
+    if markup_format == "markdown":
+        return split_markdown(text)
+    return split_html(text)
+
+
+def tokenize_markup_spans(spans: List[dict], model_name: str, debug_level: str, tracker=None,
+                          max_span_tokens: int = DEFAULT_MAX_SPAN_TOKENS) -> List[dict]:
+    """
+    Count tokens for markup spans; spans over the limit are split with the
+    fallback chunker and every piece keeps the span's heading_path.
+    Returns list of dictionaries with 'content', 'tokens' and 'heading_path' keys.
+    """
+    chunks = []
+    for span in spans:
+        if tracker is not None and tracker.expired():
+            tracker.record("markup", "truncated", f"time budget exceeded after {len(chunks)} chunks")
+            break
+        tokens = count_tokens(span["content"], model_name)
+        if tokens > max_span_tokens:
+            if debug_level == "VERBOSE":
+                print(f"[INFO] Splitting {span['kind']} section {' > '.join(span['heading_path']) or '(top)'} "
+                      f"with {tokens} tokens")
+            pieces = fallback_chunk(span["content"], model_name, tracker, stage="markup")
+        else:
+            pieces = [{"content": span["content"], "tokens": tokens}]
+        for piece in pieces:
+            piece["heading_path"] = span["heading_path"]
+            chunks.append(piece)
+    return chunks
@@ -0,0 +1,135 @@
+"""
+Precompiled routing for chunk_file.
+The tables in chunker_config.py are compiled once at import into immutable
+profiles, so each file costs one lookup instead of separate language, chunkability,
+node-type and reader resolution:
+
+- LanguageProfile: frozen node types, tree-sitter eligibility, span token limit, parser handle
+- FileProfile:     language profile + reader function + markup format for an extension/file name
+
+Overrides go through override_language() / map_extension(), which rebuild the
+tables copy-on-write instead of mutating chunker_config's globals.
+"""
+
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, NamedTuple, Optional
+
+from .chunker_config import CHUNKABLE_LANGUAGES, EXT_TO_LANG, LANG_FUNCTION_NODES, MARKUP_EXTENSIONS
+from .read_file_content import _read_text, get_reader, supported_keys
+
+DEFAULT_MAX_SPAN_TOKENS = 400  # Blocks above this are split with the fallback chunker
+
+_thread_parsers = threading.local()  # tree-sitter parsers are not thread-safe; one per thread
+
+
+class LanguageProfile(NamedTuple):
+    name: str
+    chunkable: bool
+    node_types: frozenset
+    max_span_tokens: int = DEFAULT_MAX_SPAN_TOKENS
+
+    def parser(self):
+        """Tree-sitter parser for this language, created once per thread."""
+        parsers = _thread_parsers.__dict__
+        parser = parsers.get(self.name)
+        if parser is None:
+            from tree_sitter_languages import get_parser
+            parser = parsers[self.name] = get_parser(self.name)
+        return parser
+
+
+class FileProfile(NamedTuple):
+    language: LanguageProfile
+    reader: Optional[Callable]   # reader(data, tracker) -> str, None if unsupported
+    markup: Optional[str]        # 'markdown' / 'html' / 'xml' for the markup chunker
+
+
+def _language_profile(name: str) -> LanguageProfile:
+    return LanguageProfile(
+        name=name,
+        chunkable=name in CHUNKABLE_LANGUAGES,
+        node_types=frozenset(LANG_FUNCTION_NODES.get(name, LANG_FUNCTION_NODES["default"])),
+    )
+
+
+def _file_profile(key: str, language: LanguageProfile, mapped: bool) -> FileProfile:
+    markup = MARKUP_EXTENSIONS.get(key.lower())
+    reader = get_reader(key, markup is not None)
+    if reader is None and mapped:
+        reader = _read_text  # Keys added with map_extension() are read as text
+    return FileProfile(language, reader, markup)
+
+
+def _compile(languages: dict, ext_to_lang: dict):
+    languages = MappingProxyType(dict(languages))
+    files = {}
+    # Reader-only keys (documents, plain text) route to the default language
+    for key in set(ext_to_lang) | set(MARKUP_EXTENSIONS) | supported_keys():
+        language = languages.get(ext_to_lang.get(key, "default"), languages["default"])
+        files[key] = _file_profile(key, language, key in ext_to_lang)
+    files[None] = FileProfile(languages["default"], None, None)  # Anything unlisted
+    return languages, MappingProxyType(files)
+
+
+_lock = threading.Lock()
+_languages, _files = _compile(
+    {name: _language_profile(name)
+     for name in set(LANG_FUNCTION_NODES) | CHUNKABLE_LANGUAGES | set(EXT_TO_LANG.values())},
+    EXT_TO_LANG,
+)
+_ext_to_lang = MappingProxyType(dict(EXT_TO_LANG))
+
+
+def resolve_profile(file_path: str) -> FileProfile:
+    """Profile for a path: exact file name first, then the lower-cased extension."""
+    files = _files
+    name = os.path.basename(file_path)
+    return files.get(name) or files.get(os.path.splitext(name)[1].lower()) or files[None]
+
+
+def get_language_profile(language: str) -> LanguageProfile:
+    """Profile for a language name (falls back to 'default')."""
+    return _languages.get(language, _languages["default"])
+
+
+def override_language(name: str, node_types=None, chunkable: Optional[bool] = None,
+                      max_span_tokens: Optional[int] = None) -> LanguageProfile:
+    """
+    Change (or add) a language profile without editing chunker_config.
+    Only the given fields change; file profiles using the language are rebuilt.
+    """
+    global _languages, _files
+    with _lock:
+        profile = _languages.get(name) or _language_profile(name)
+        changes = {}
+        if node_types is not None:
+            changes["node_types"] = frozenset(node_types)
+        if chunkable is not None:
+            changes["chunkable"] = chunkable
+        if max_span_tokens is not None:
+            changes["max_span_tokens"] = max_span_tokens
+        languages = dict(_languages)
+        languages[name] = profile._replace(**changes)
+        _languages, _files = _compile(languages, _ext_to_lang)
+        return _languages[name]
+
+
+def map_extension(key: str, language: str) -> FileProfile:
+    """
+    Route an extension ('.foo') or exact file name ('Jenkinsfile') to a language.
+    Keys without a dedicated reader are read as text.
+    """
+    global _languages, _files, _ext_to_lang
+    if key.startswith("."):
+        key = key.lower()  # resolve_profile looks extensions up lower-cased
+    with _lock:
+        ext_to_lang = dict(_ext_to_lang)
+        ext_to_lang[key] = language
+        languages = dict(_languages)
+        if language not in languages:
+            languages[language] = _language_profile(language)
+        _ext_to_lang = MappingProxyType(ext_to_lang)
+        _languages, _files = _compile(languages, _ext_to_lang)
+        return _files[key]
@@ -1,11 +1,19 @@
 """
 Minimalistic file content reader.
 Returns file content as string or empty string if unsupported/error.
+Works from a path (read_file_content) or from in-memory bytes (read_bytes_content).
 """
 
-import pathlib
+import codecs
 import csv
-from .chunker_config import EXT_TO_LANG
+import io
+import pathlib
+from types import MappingProxyType
+from .chunker_config import EXT_TO_LANG, MARKUP_EXTENSIONS
+
+# Formats that need the whole file to be parsed (cannot be truncated)
+BINARY_DOCUMENT_EXTENSIONS = {'.pdf', '.docx', '.doc', '.odt', '.xlsx', '.xls', '.ods', '.pptx', '.ppt'}
+PLAIN_TEXT_EXTENSIONS = {'.txt', '.text', '.log', '.ini', '.cfg', '.conf', '.env', '.properties'}
 
 # Document format imports - fail silently
 try:
@@ -65,40 +73,40 @@ except ImportError:
     HAS_MARKDOWN = False
 
 
-def _detect_encoding(file_path):
-    """Detect file encoding."""
+def _detect_encoding(data):
+    """Detect the encoding of raw bytes."""
     if HAS_CHARDET:
         try:
-            with open(file_path, 'rb') as f:
-                result = chardet.detect(f.read(10000))
-                return result['encoding'] or 'utf-8'
+            result = chardet.detect(data[:10000])
+            return result['encoding'] or 'utf-8'
         except:
             pass
     
     for encoding in ['utf-8', 'utf-16', 'latin-1', 'cp1252']:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                f.read(1000)
+            codecs.getincrementaldecoder(encoding)().decode(data[:4096])
             return encoding
         except:
             continue
     return 'utf-8'
 
 
-def _read_text_file(file_path):
-    """Read text file with encoding detection."""
-    encoding = _detect_encoding(file_path)
+def _decode_text(data):
+    """Decode text bytes with encoding detection."""
     try:
-        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-            return f.read()
+        return data.decode(_detect_encoding(data), errors='ignore')
     except:
         return ""
 
 
-def read_file_content(file_path):
+def read_file_content(file_path, tracker=None, raw_markup=False, reader=None):
     """
     Read file content and return as string.
     Returns empty string if file is unsupported, symlink, or error occurs.
+    With raw_markup, Markdown/HTML/XML are returned as source instead of rendered text.
+    With a BudgetTracker, files over max_bytes are truncated (text) or skipped
+    (binary documents), and slow document extraction stops at the deadline.
+    reader skips the routing lookup when the caller already resolved it (see profiles.py).
     """
     try:
         file_path = pathlib.Path(file_path)
@@ -107,89 +115,202 @@ def read_file_content(file_path):
         if not file_path.exists() or file_path.is_symlink():
             return ""
         
-        ext = file_path.suffix.lower()
-        filename = file_path.name
+        if reader is None:
+            reader = resolve_reader(file_path.name, raw_markup)
+        if reader is None:
+            return ""
         
-        # Document formats first
-        if ext == '.pdf' and HAS_PDF:
+        max_bytes = tracker.budget.max_bytes if tracker is not None else None
+        if max_bytes is not None and file_path.stat().st_size > max_bytes:
+            if file_path.suffix.lower() in BINARY_DOCUMENT_EXTENSIONS:
+                tracker.record("read", "skipped", f"file larger than {max_bytes} bytes")
+                return ""
+            tracker.record("read", "truncated", f"file larger than {max_bytes} bytes")
             with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                return '\n'.join(page.extract_text() for page in reader.pages)
-        
-        elif ext in ['.docx', '.doc'] and HAS_DOCX:
-            doc = Document(file_path)
-            return '\n'.join(p.text for p in doc.paragraphs)
-        
-        elif ext == '.odt' and HAS_ODF:
-            doc = load(file_path)
-            allparas = doc.getElementsByType(text.P)
-            return '\n'.join(teletype.extractText(para) for para in allparas if teletype.extractText(para).strip())
-        
-        elif ext == '.rtf' and HAS_RTF:
-            return rtf_to_text(_read_text_file(file_path))
-        
-        elif ext in ['.xlsx', '.xls'] and HAS_EXCEL:
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            content = []
-            for sheet in wb.worksheets:
-                for row in sheet.iter_rows(values_only=True):
-                    if any(cell for cell in row if cell is not None):
-                        content.append(' | '.join(str(cell) if cell else '' for cell in row))
-            return '\n'.join(content)
+                return reader(f.read(max_bytes), tracker)
         
-        elif ext == '.ods' and HAS_ODF:
-            doc = load(file_path)
-            rows = doc.spreadsheet.getElementsByType(TableRow)
-            content = []
-            for row in rows:
-                cells = row.getElementsByType(TableCell)
-                row_data = []
-                for cell in cells:
-                    paragraphs = cell.getElementsByType(text.P)
-                    cell_text = "".join(teletype.extractText(p) for p in paragraphs)
-                    row_data.append(cell_text.strip())
-                if any(cell.strip() for cell in row_data):
-                    content.append(' | '.join(row_data))
-            return '\n'.join(content)
+        return reader(file_path.read_bytes(), tracker)
         
-        elif ext in ['.pptx', '.ppt'] and HAS_PPTX:
-            prs = Presentation(file_path)
-            content = []
-            for slide in prs.slides:
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text.strip():
-                        content.append(shape.text.strip())
-            return '\n'.join(content)
-        
-        elif ext == '.csv':
-            encoding = _detect_encoding(file_path)
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                return '\n'.join(' | '.join(row) for row in csv.reader(f))
-        
-        elif ext in ['.html', '.htm'] and HAS_BS4:
-            content = _read_text_file(file_path)
-            soup = BeautifulSoup(content, 'html.parser')
-            return soup.get_text()
-        
-        elif ext in ['.md', '.markdown'] and HAS_MARKDOWN and HAS_BS4:
-            content = _read_text_file(file_path)
-            html = markdown.markdown(content)
-            return BeautifulSoup(html, 'html.parser').get_text()
-        
-        elif ext == '.xml' and HAS_BS4:
-            content = _read_text_file(file_path)
-            return BeautifulSoup(content, 'xml').get_text()
-        
-        # Check if it's a known code/text file from chunker_config
-        elif ext in EXT_TO_LANG or filename in EXT_TO_LANG:
-            return _read_text_file(file_path)
-        
-        # Try as text file for common extensions
-        elif ext in ['.txt', '.text', '.log', '.ini', '.cfg', '.conf', '.env', '.properties']:
-            return _read_text_file(file_path)
-        
-        # Default: empty string for unsupported
+    except Exception:
         return ""
-        
+
+
+def read_bytes_content(data, file_name, tracker=None, raw_markup=False, reader=None):
+    """
+    Extract text from in-memory file bytes, routing on file_name's extension
+    exactly like read_file_content. Used for sources that never touch the
+    filesystem (git blobs, archive members).
+    Returns empty string if the format is unsupported or an error occurs.
+    With a BudgetTracker, data over max_bytes is truncated (text) or skipped
+    (binary documents) like files on disk.
+    """
+    try:
+        if reader is None:
+            reader = resolve_reader(file_name, raw_markup)
+        if reader is None:
+            return ""
+
+        max_bytes = tracker.budget.max_bytes if tracker is not None else None
+        if max_bytes is not None and len(data) > max_bytes:
+            if pathlib.PurePath(file_name).suffix.lower() in BINARY_DOCUMENT_EXTENSIONS:
+                tracker.record("read", "skipped", f"file larger than {max_bytes} bytes")
+                return ""
+            tracker.record("read", "truncated", f"file larger than {max_bytes} bytes")
+            data = data[:max_bytes]
+
+        return reader(data, tracker)
     except Exception:
         return ""
+
+
+def is_readable_name(file_name):
+    """Check whether a file name has a format read_bytes_content can extract text from."""
+    return resolve_reader(file_name, raw_markup=True) is not None
+
+
+def resolve_reader(file_name, raw_markup=False):
+    """
+    Reader for a file name as routed by profiles.resolve_profile, so keys added
+    with map_extension() are honoured. Without raw_markup, Markdown/HTML/XML
+    get the rendered-text reader instead of their source.
+    """
+    from .profiles import resolve_profile  # profiles imports this module
+    profile = resolve_profile(file_name)
+    if profile.markup is not None and not raw_markup:
+        return get_reader(file_name)
+    return profile.reader
+
+
+def supported_keys(raw_markup=False):
+    """Extensions and exact file names that have a reader (given the installed optional packages)."""
+    return frozenset(_RAW_MARKUP_READERS if raw_markup else _READERS)
+
+
+def get_reader(file_name, raw_markup=False):
+    """
+    Return the built-in reader function(data, tracker) -> str for a file name, or None if unsupported.
+    Routing is precomputed at import: extension first, then exact file name.
+    This is the table profiles.py compiles from; use resolve_reader() to honour overrides.
+    """
+    table = _RAW_MARKUP_READERS if raw_markup else _READERS
+    path = pathlib.PurePath(file_name)
+    return table.get(path.suffix.lower()) or table.get(path.name)
+
+
+def _until_deadline(items, tracker):
+    """Yield items until the tracker's deadline passes, recording the truncation."""
+    for item in items:
+        if tracker is not None and tracker.expired():
+            tracker.record("read", "truncated", "time budget exceeded")
+            return
+        yield item
+
+
+def _read_text(data, tracker=None):
+    return _decode_text(data)
+
+
+def _read_pdf(data, tracker=None):
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() for page in _until_deadline(reader.pages, tracker))
+
+
+def _read_docx(data, tracker=None):
+    doc = Document(io.BytesIO(data))
+    return '\n'.join(p.text for p in doc.paragraphs)
+
+
+def _read_odt(data, tracker=None):
+    doc = load(io.BytesIO(data))
+    allparas = doc.getElementsByType(text.P)
+    return '\n'.join(teletype.extractText(para) for para in allparas if teletype.extractText(para).strip())
+
+
+def _read_rtf(data, tracker=None):
+    return rtf_to_text(_decode_text(data))
+
+
+def _read_excel(data, tracker=None):
+    wb = openpyxl.load_workbook(io.BytesIO(data), data_only=True)
+    content = []
+    rows = (row for sheet in wb.worksheets for row in sheet.iter_rows(values_only=True))
+    for row in _until_deadline(rows, tracker):
+        if any(cell for cell in row if cell is not None):
+            content.append(' | '.join(str(cell) if cell else '' for cell in row))
+    return '\n'.join(content)
+
+
+def _read_ods(data, tracker=None):
+    doc = load(io.BytesIO(data))
+    rows = doc.spreadsheet.getElementsByType(TableRow)
+    content = []
+    for row in _until_deadline(rows, tracker):
+        cells = row.getElementsByType(TableCell)
+        row_data = []
+        for cell in cells:
+            paragraphs = cell.getElementsByType(text.P)
+            cell_text = "".join(teletype.extractText(p) for p in paragraphs)
+            row_data.append(cell_text.strip())
+        if any(cell.strip() for cell in row_data):
+            content.append(' | '.join(row_data))
+    return '\n'.join(content)
+
+
+def _read_pptx(data, tracker=None):
+    prs = Presentation(io.BytesIO(data))
+    content = []
+    for slide in _until_deadline(prs.slides, tracker):
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text.strip():
+                content.append(shape.text.strip())
+    return '\n'.join(content)
+
+
+def _read_csv(data, tracker=None):
+    return '\n'.join(' | '.join(row) for row in csv.reader(io.StringIO(_decode_text(data))))
+
+
+def _read_html(data, tracker=None):
+    return BeautifulSoup(_decode_text(data), 'html.parser').get_text()
+
+
+def _read_markdown(data, tracker=None):
+    html = markdown.markdown(_decode_text(data))
+    return BeautifulSoup(html, 'html.parser').get_text()
+
+
+def _read_xml(data, tracker=None):
+    return BeautifulSoup(_decode_text(data), 'xml').get_text()
+
+
+def _build_reader_tables():
+    """Compile extension/file-name routing once, honouring which optional readers are installed."""
+    readers = {}
+    # Known code/text files from chunker_config and common plain-text extensions
+    for key in list(EXT_TO_LANG) + sorted(PLAIN_TEXT_EXTENSIONS):
+        readers[key] = _read_text
+    readers['.csv'] = _read_csv
+    # Document formats take precedence over the plain-text mapping
+    optional = [
+        (HAS_PDF, ['.pdf'], _read_pdf),
+        (HAS_DOCX, ['.docx', '.doc'], _read_docx),
+        (HAS_ODF, ['.odt'], _read_odt),
+        (HAS_RTF, ['.rtf'], _read_rtf),
+        (HAS_EXCEL, ['.xlsx', '.xls'], _read_excel),
+        (HAS_ODF, ['.ods'], _read_ods),
+        (HAS_PPTX, ['.pptx', '.ppt'], _read_pptx),
+        (HAS_BS4, ['.html', '.htm'], _read_html),
+        (HAS_MARKDOWN and HAS_BS4, ['.md', '.markdown'], _read_markdown),
+        (HAS_BS4, ['.xml'], _read_xml),
+    ]
+    for available, extensions, reader in optional:
+        if available:
+            for ext in extensions:
+                readers[ext] = reader
+    raw_markup = dict(readers)
+    for ext in MARKUP_EXTENSIONS:
+        raw_markup[ext] = _read_text
+    return MappingProxyType(readers), MappingProxyType(raw_markup)
+
+
+_READERS, _RAW_MARKUP_READERS = _build_reader_tables()
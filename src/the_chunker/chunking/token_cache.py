@@ -0,0 +1,211 @@
+"""
+Token-count memoization.
+Counts are keyed by (model name, content hash) so identical strings -- license
+headers, imports, boilerplate, unchanged chunks across reruns -- are only
+tokenized once. An in-memory LRU sits in front of an optional SQLite store
+that can be shared between processes and runs.
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 100_000  # In-memory LRU bound (entries, not bytes)
+DISK_FLUSH_EVERY = 256         # Pending disk writes before an automatic commit
+DISK_FLUSH_SECONDS = 5.0       # ...or seconds since the last commit, whichever comes first
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a string, used as the cache key."""
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+
+class TokenCountCache:
+    """
+    LRU cache of token counts per model with optional on-disk persistence.
+    Safe to share between threads; the disk store is safe to share between processes.
+    The SQLite connection is opened lazily per process, so a forked worker never
+    reuses its parent's connection. Pending writes are committed by size or age;
+    processes that exit without atexit handlers (pool workers) should call flush().
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            atexit.register(self.close)
+
+    def _after_fork_check(self) -> None:
+        """Drop state inherited from a parent process. Call with the lock held."""
+        if self._conn is not None and self._conn_pid != os.getpid():
+            # Never use or close the parent's connection here (unsafe across fork),
+            # and leave the parent's pending writes to the parent
+            _inherited_connections.append(self._conn)
+            self._conn = None
+            self._pending = {}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite connection for the current process, opened on first use. Call with the lock held."""
+        if not self.disk_path:
+            return None
+        if self._conn is not None:
+            return self._conn
+        self._conn = sqlite3.connect(self.disk_path, timeout=30, check_same_thread=False)
+        self._conn_pid = os.getpid()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_counts ("
+            "model TEXT NOT NULL, hash TEXT NOT NULL, tokens INTEGER NOT NULL, "
+            "PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+        return self._conn
+
+    def get(self, text: str, model_name: str) -> Optional[int]:
+        """Return the cached token count for text, or None on a miss."""
+        key = (model_name, content_hash(text))
+        with self._lock:
+            self._after_fork_check()
+            tokens = self._memory.get(key)
+            if tokens is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return tokens
+
+            tokens = self._pending.get(key)
+            if tokens is not None:
+                # Evicted from memory but not committed yet; still an in-process hit
+                self._remember(key, tokens)
+                self.hits += 1
+                return tokens
+
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT tokens FROM token_counts WHERE model = ? AND hash = ?", key
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, model_name: str, tokens: int) -> None:
+        """Store the token count for text."""
+        key = (model_name, content_hash(text))
+        with self._lock:
+            self._after_fork_check()
+            self._remember(key, tokens)
+            if self.disk_path:
+                self._pending[key] = tokens
+                if len(self._pending) >= DISK_FLUSH_EVERY or \
+                        time.monotonic() - self._last_flush >= DISK_FLUSH_SECONDS:
+                    self._flush_locked()
+
+    def _remember(self, key, tokens: int) -> None:
+        self._memory[key] = tokens
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_locked(self) -> None:
+        conn = self._connection()
+        if conn is None or not self._pending:
+            return
+        conn.executemany(
+            "INSERT OR REPLACE INTO token_counts (model, hash, tokens) VALUES (?, ?, ?)",
+            [(model, digest, tokens) for (model, digest), tokens in self._pending.items()],
+        )
+        conn.commit()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Write pending counts to the disk store."""
+        with self._lock:
+            self._after_fork_check()
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush and close the disk store (no-op for memory-only caches)."""
+        with self._lock:
+            self._after_fork_check()
+            if self._conn is None and not self._pending:
+                return
+            try:
+                self._flush_locked()
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset statistics (disk store is kept)."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and hit rate since creation or the last clear()."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_inherited_connections = []  # Parent connections seen after a fork; kept referenced so they are never closed here
+_cache: Optional[TokenCountCache] = TokenCountCache()
+
+
+def get_token_cache() -> Optional[TokenCountCache]:
+    """Return the cache used by count_tokens (None when disabled)."""
+    return _cache
+
+
+def configure_token_cache(max_entries: int = DEFAULT_MAX_ENTRIES, disk_path: Optional[str] = None,
+                          enabled: bool = True) -> Optional[TokenCountCache]:
+    """
+    Replace the cache used by count_tokens.
+    Pass disk_path to persist counts in a SQLite file shared between processes and runs,
+    or enabled=False to turn memoization off entirely.
+    """
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = TokenCountCache(max_entries, disk_path) if enabled else None
+    return _cache
+
+
+@contextmanager
+def token_cache_disabled():
+    """Bypass the cache inside the block (every count is tokenized), then restore it untouched."""
+    global _cache
+    saved, _cache = _cache, None
+    try:
+        yield
+    finally:
+        _cache = saved
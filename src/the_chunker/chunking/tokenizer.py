@@ -1,5 +1,6 @@
 from transformers import AutoTokenizer
 from typing import List, Dict
+from .token_cache import get_token_cache
 
 # This is the exact model you're using for embedding.
 # Qwen3 has a specific tokenizer – don't fuck around with tiktoken or GPT tokenizers here.
@@ -11,7 +12,14 @@ def count_tokens(text: str, model_name: str) -> int:
     """
     Count the number of tokens in a single string using the Qwen3 tokenizer.
     No special tokens like [CLS] or [SEP] are added—this is raw count.
+    Counts are memoized per model by content hash (see token_cache.py).
     """
+    cache = get_token_cache()
+    if cache is not None:
+        cached = cache.get(text, model_name)
+        if cached is not None:
+            return cached
+
     try:
         tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
     except RepositoryNotFoundError:
@@ -38,7 +46,10 @@ def count_tokens(text: str, model_name: str) -> int:
         print(f"Unexpected error: {e}")
         raise
 
-    return len(tokenizer.encode(text, add_special_tokens=False))
+    tokens = len(tokenizer.encode(text, add_special_tokens=False))
+    if cache is not None:
+        cache.put(text, model_name, tokens)
+    return tokens
 
 def assign_tokens_to_blocks(blocks: List[str], model_name:  str) -> List[Dict]:
     """
@@ -1,6 +1,5 @@
 from typing import List
-from tree_sitter_languages import get_parser  # <-- correct import for tree_sitter_languages
-from .chunker_config import LANG_FUNCTION_NODES
+from .profiles import DEFAULT_MAX_SPAN_TOKENS, get_language_profile
 from .tokenizer import count_tokens 
 from .fallback_chunker import fallback_chunk
 
@@ -28,9 +27,26 @@ def slice_node(node, code_bytes: bytes) -> str:
 
     return code_bytes[start:end].decode("utf-8", errors="replace")
 
-def extract_code_blocks(code: str, language_name: str, model_name: str, debug_level: str) -> List[dict]:  
+def extract_code_blocks(code: str, language_name: str, model_name: str, debug_level: str, tracker=None) -> List[dict]:  
+    """
+    Extract semantic blocks with tree-sitter.
+    With a BudgetTracker, raises BudgetExceeded once the file's deadline passes.
+    """
+    spans = extract_code_spans(code, language_name, debug_level, tracker)
+    max_span_tokens = get_language_profile(language_name).max_span_tokens
+    result = tokenize_code_spans(spans, model_name, debug_level, tracker, max_span_tokens)
+    if debug_level == "VERBOSE": 
+        print(f"[INFO] Extracted {len(result)} chunks")
+    return result
+
+def extract_code_spans(code: str, language_name: str, debug_level: str, tracker=None) -> List[tuple]:
+    """
+    Parse code and return (node_type, source) for every matching node, in tree order.
+    This is the parse half of extract_code_blocks; no tokenizer is involved.
+    """
+    profile = get_language_profile(language_name)
     try:
-        parser = get_parser(language_name)
+        parser = profile.parser()
         if parser is None:
             print(f"[ERROR] No parser found for language: {language_name}")
             return []
@@ -44,36 +60,51 @@ def extract_code_blocks(code: str, language_name: str, model_name: str, debug_le
     tree = parser.parse(code_bytes)
     root = tree.root_node
     
-    valid_node_types = LANG_FUNCTION_NODES.get(language_name, LANG_FUNCTION_NODES["default"])
+    valid_node_types = profile.node_types
     if debug_level=="VERBOSE":
         print(f"Valid node types for '{language_name}': {valid_node_types}")
     
     def recurse(node):
-        chunks = []
+        if tracker is not None:
+            tracker.check("ast")
+        spans = []
         if node.type in valid_node_types:
-            chunk_content = slice_node(node, code_bytes)
-            tokens = count_tokens(chunk_content, model_name)
-            
-            if tokens > 400:
-                # For large functions/classes, break them into smaller chunks
-                if debug_level == "VERBOSE":
-                    print(f"[INFO] Found large {node.type} with {tokens} tokens (>400 limit)")
-                    print(f"[INFO] Using fallback strategy to split this {node.type} into smaller chunks")
-                content_to_append = fallback_chunk(chunk_content, model_name)
-                chunks.extend(content_to_append)
-            else: 
-                chunks.append({
-                    "content": chunk_content,
-                    "tokens": tokens
-                })
+            spans.append((node.type, slice_node(node, code_bytes)))
         
         for child in node.children:
-            chunks.extend(recurse(child))
+            spans.extend(recurse(child))
         
-        return chunks
+        return spans
+    result = recurse(root)
     if debug_level == "VERBOSE":
         print("Parsing complete. Returning results.")
-    result = recurse(root)
-    if debug_level == "VERBOSE": 
-        print(f"[INFO] Extracted {len(result)} chunks")
     return result
+
+def tokenize_code_spans(spans: List[tuple], model_name: str, debug_level: str, tracker=None,
+                        max_span_tokens: int = DEFAULT_MAX_SPAN_TOKENS) -> List[dict]:
+    """
+    Count tokens for spans from extract_code_spans, splitting oversized ones
+    with the fallback chunker. This is the tokenize half of extract_code_blocks.
+    """
+    chunks = []
+    for node_type, chunk_content in spans:
+        if tracker is not None:
+            tracker.check("ast")
+        tokens = count_tokens(chunk_content, model_name)
+        
+        if tokens > max_span_tokens:
+            # For large functions/classes, break them into smaller chunks
+            if debug_level == "VERBOSE":
+                print(f"[INFO] Found large {node_type} with {tokens} tokens (>{max_span_tokens} limit)")
+                print(f"[INFO] Using fallback strategy to split this {node_type} into smaller chunks")
+            # Bounded by the AST deadline; past it the whole file degrades to the fallback chunker
+            content_to_append = fallback_chunk(chunk_content, model_name, tracker, stage="ast")
+            if tracker is not None:
+                tracker.check("ast")
+            chunks.extend(content_to_append)
+        else: 
+            chunks.append({
+                "content": chunk_content,
+                "tokens": tokens
+            })
+    return chunks
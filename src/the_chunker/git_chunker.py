@@ -0,0 +1,174 @@
+"""
+Chunk the files changed between two revisions of a local git repository.
+Blobs are read straight from the object store (no checkout, no network), so
+CI can index a diff range without materializing the working tree.
+"""
+
+import subprocess
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .chunking import chunk_bytes
+from .chunking.profiles import resolve_profile
+from .chunking.read_file_content import is_readable_name
+from .my_overlap_chunker import merge_with_overlap
+
+REGULAR_FILE_MODES = {"100644", "100755"}  # Symlinks (120000) and submodules (160000) are skipped
+SKIPPED_MODES = {"120000": "symlink", "160000": "submodule"}
+
+
+def _run_git(repo_path: str, *args: str) -> bytes:
+    result = subprocess.run(["git", "-C", repo_path, *args], capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def diff_blobs(repo_path: str, old_rev: str, new_rev: str) -> List[Dict]:
+    """
+    List blob-level changes between two revisions.
+    Returns [{'status', 'path', 'old_blob', 'new_blob', 'old_mode', 'new_mode'}, ...]
+    where status is git's A/M/D/T letter. Renames are reported as D + A.
+    """
+    raw = _run_git(repo_path, "diff-tree", "-r", "-z", "--raw", "--no-renames", old_rev, new_rev)
+    fields = raw.split(b"\0")
+    changes = []
+    i = 0
+    while i + 1 < len(fields):
+        meta, path = fields[i], fields[i + 1]
+        i += 2
+        if not meta.startswith(b":"):
+            continue
+        old_mode, new_mode, old_blob, new_blob, status = meta[1:].decode().split(" ")
+        changes.append({
+            "status": status[0],
+            "path": path.decode("utf-8", errors="surrogateescape"),
+            "old_blob": old_blob,
+            "new_blob": new_blob,
+            "old_mode": old_mode,
+            "new_mode": new_mode,
+        })
+    return changes
+
+
+def read_blobs(repo_path: str, blob_ids: List[str], max_bytes: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream (blob_id, data) pairs from the object store with a single `git cat-file --batch`.
+    With max_bytes, at most max_bytes + 1 bytes of each blob are kept (the rest is
+    discarded), so callers can still tell the blob was oversized.
+    """
+    if not blob_ids:
+        return
+    proc = subprocess.Popen(
+        ["git", "-C", repo_path, "cat-file", "--batch"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for blob_id in blob_ids:
+            proc.stdin.write(blob_id.encode() + b"\n")
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+            if len(header) != 3 or header[1] != b"blob":
+                print(f"[WARN] Could not read blob {blob_id} from {repo_path}")
+                continue
+            size = int(header[2])
+            keep = size if max_bytes is None else min(size, max_bytes + 1)
+            data = proc.stdout.read(keep)
+            remaining = size - keep
+            while remaining > 0:
+                skipped = proc.stdout.read(min(remaining, 1 << 20))
+                if not skipped:
+                    break
+                remaining -= len(skipped)
+            proc.stdout.read(1)  # Trailing newline after each object
+            yield blob_id, data
+    finally:
+        proc.stdin.close()
+        proc.stdout.close()
+        proc.wait()
+
+
+def _seen_key(blob: str, profile) -> str:
+    """seen_blobs entry: the blob id plus the routing it was chunked with."""
+    reader = getattr(profile.reader, "__name__", "")
+    return f"{blob}:{profile.language.name}:{profile.markup or ''}:{reader}"
+
+
+def turn_git_diff_to_chunks(repo_path: str, old_rev: str, new_rev: str, debug_level: str = "NONE",
+                            model_name: str = "Qwen/Qwen3-Embedding-8B",
+                            seen_blobs: Optional[Set[str]] = None, budget=None) -> Dict:
+    """
+    Chunk added/modified files between old_rev and new_rev of a local repository.
+
+    Every added/modified path gets a 'changed' entry, which replaces whatever was
+    indexed for that path with the content of its blob. seen_blobs holds one
+    entry per blob and routing (language, markup format, reader), so the same
+    content reached through a different file type is chunked again. A blob
+    already in seen_blobs with this path's routing is not chunked: its entry has
+    'chunks': None, meaning "reuse the chunks already indexed for this blob".
+    New entries are added to seen_blobs, so the same set can be passed across
+    runs; renames (reported as D + A) and reverts to an earlier blob then cost
+    no chunking. Symlinks and submodules are reported as skipped.
+    Final chunks are tagged with 'path' and 'blob'.
+    budget is an optional FileBudget applied to every blob.
+
+    Returns:
+        {
+          'changed': [{'path', 'blob', 'status', 'chunks'}, ...],
+          'deleted': [{'path', 'blob'}, ...],   # drop these from downstream indexes
+          'skipped': [{'path', 'blob', 'reason'}, ...],
+        }
+    """
+    if seen_blobs is None:
+        seen_blobs = set()
+
+    report = {"changed": [], "deleted": [], "skipped": []}
+    to_read = {}  # blob -> {file profile -> [(path, status), ...]}
+
+    for change in diff_blobs(repo_path, old_rev, new_rev):
+        path = change["path"]
+        old_is_file = change["old_mode"] in REGULAR_FILE_MODES
+        new_is_file = change["new_mode"] in REGULAR_FILE_MODES
+
+        if old_is_file and (change["status"] == "D" or not new_is_file):
+            report["deleted"].append({"path": path, "blob": change["old_blob"]})
+        if change["status"] == "D":
+            if not old_is_file:
+                reason = SKIPPED_MODES.get(change["old_mode"], "not a regular file")
+                report["skipped"].append({"path": path, "blob": change["old_blob"], "reason": f"{reason} deleted"})
+            continue
+
+        blob = change["new_blob"]
+        profile = resolve_profile(path)
+        if not new_is_file:
+            reason = SKIPPED_MODES.get(change["new_mode"], "not a regular file")
+            report["skipped"].append({"path": path, "blob": blob, "reason": reason})
+        elif not is_readable_name(path):
+            report["skipped"].append({"path": path, "blob": blob, "reason": "unsupported format"})
+        elif _seen_key(blob, profile) in seen_blobs:
+            report["changed"].append({"path": path, "blob": blob, "status": change["status"], "chunks": None})
+            if debug_level == "VERBOSE":
+                print(f"[INFO] {change['status']} {path} ({blob[:10]}): already chunked, reusing")
+        else:
+            # Identical blobs are chunked once per routing, not once per path
+            to_read.setdefault(blob, {}).setdefault(profile, []).append((path, change["status"]))
+
+    max_bytes = budget.max_bytes if budget is not None else None
+    for blob, data in read_blobs(repo_path, list(to_read), max_bytes):
+        for profile, paths in to_read.pop(blob).items():
+            seen_blobs.add(_seen_key(blob, profile))
+            semantic_chunks = chunk_bytes(data, paths[0][0], model_name, debug_level, budget)
+            final_chunks = merge_with_overlap(semantic_chunks) if semantic_chunks else []
+
+            for path, status in paths:
+                chunks = [dict(chunk, path=path, blob=blob) for chunk in final_chunks]
+                report["changed"].append({"path": path, "blob": blob, "status": status, "chunks": chunks})
+                if debug_level == "VERBOSE":
+                    print(f"[INFO] {status} {path} ({blob[:10]}): {len(chunks)} final chunks")
+
+    # Whatever is left could not be read from the object store
+    for blob, by_profile in to_read.items():
+        for paths in by_profile.values():
+            for path, _ in paths:
+                report["skipped"].append({"path": path, "blob": blob, "reason": "could not read blob"})
+
+    return report
@@ -20,6 +20,9 @@ def merge_with_overlap(semantic_chunks):
     while curr_index < len(semantic_chunks):
         first_index_new_chunk = curr_index
         new_chunk = {"content": "", "tokens": 0, "overlap_tokens": 0}
+        # markup chunks carry their section; the merged chunk keeps the one it starts in
+        if "heading_path" in semantic_chunks[curr_index]:
+            new_chunk["heading_path"] = semantic_chunks[curr_index]["heading_path"]
 
         while curr_index < len(semantic_chunks) and new_chunk["tokens"] < 400:
             new_chunk["content"] += semantic_chunks[curr_index]["content"]
@@ -0,0 +1,206 @@
+"""
+Pipelined, multi-threaded chunking of many files.
+
+Files flow through four stages connected by bounded queues:
+
+    read -> parse -> tokenize -> merge/sink
+
+Tree-sitter parsing (C) and fast tokenizers (Rust) release the GIL, so threads
+overlap I/O, parsing and tokenization without the memory cost of one tokenizer
+copy per process. Each stage reports how busy its workers were and how full its
+input queue got, which shows where the bottleneck is.
+
+With a FileBudget, each file's clock is paused while it waits between stages,
+so max_seconds bounds the work done on the file, not the backpressure.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .chunking.profiles import resolve_profile
+from .chunking.dispatcher import parse_content, tokenize_content
+from .chunking.read_file_content import read_file_content
+from .my_overlap_chunker import merge_with_overlap
+
+_DONE = object()  # Sentinel passed down the queues once the input is exhausted
+
+
+class _Stage:
+    """A pool of worker threads reading one queue and feeding the next."""
+
+    def __init__(self, name: str, fn: Callable, workers: int, inbox: queue.Queue, outbox: Optional[queue.Queue],
+                 next_workers: int):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox = inbox
+        self.outbox = outbox
+        self.next_workers = next_workers
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.queue_max = 0
+        self._finished = 0
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"chunker-{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                with self._lock:
+                    self._finished += 1
+                    last = self._finished == self.workers
+                if last and self.outbox is not None:
+                    for _ in range(self.next_workers):
+                        self.outbox.put(_DONE)
+                return
+            with self._lock:
+                self.queue_max = max(self.queue_max, self.inbox.qsize() + 1)
+
+            started = time.perf_counter()
+            try:
+                result = self.fn(item)
+            except Exception as e:
+                print(f"[ERROR] {self.name} stage failed for {item.get('path')}: {e}")
+                result = dict(item, blocks=[], spans=None, content="")
+                with self._lock:
+                    self.errors += 1
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self.items += 1
+                self.busy_seconds += elapsed
+            if self.outbox is not None:
+                self.outbox.put(result)
+
+
+class ChunkingPipeline:
+    """
+    Chunk many files with a thread per stage worker.
+
+    pipeline = ChunkingPipeline(model_name, readers=2, parsers=2, tokenizers=2)
+    results = pipeline.run(paths)          # {path: final_chunks}
+    pipeline.stats()                       # per-stage occupancy
+
+    Pass sink=callable(path, final_chunks) to stream results instead of
+    collecting them; the sink runs on the single merge thread.
+    """
+
+    def __init__(self, model_name: str = "Qwen/Qwen3-Embedding-8B", debug_level: str = "NONE",
+                 readers: int = 2, parsers: int = 2, tokenizers: int = 2, queue_size: int = 64, budget=None):
+        self.model_name = model_name
+        self.debug_level = debug_level
+        self.readers = readers
+        self.parsers = parsers
+        self.tokenizers = tokenizers
+        self.queue_size = queue_size
+        self.budget = budget
+        self._stages: List[_Stage] = []
+        self._wall_seconds = 0.0
+
+    def _read(self, item):
+        path = item["path"]
+        tracker = self.budget.start(path) if self.budget is not None else None
+        profile = resolve_profile(path)
+        content = read_file_content(path, tracker, reader=profile.reader) if profile.reader else ""
+        if content == "" and self.debug_level == "VERBOSE":
+            print(f"[INFO] No readable content in {os.path.basename(path)}")
+        if tracker is not None:
+            tracker.pause()  # Time spent queued for the next stage is not the file's fault
+        return dict(item, content=content, tracker=tracker, profile=profile)
+
+    def _parse(self, item):
+        if item["content"] == "":
+            return dict(item, spans=None)
+        tracker = item["tracker"]
+        if tracker is not None:
+            tracker.resume()
+        spans = parse_content(item["content"], item["profile"], self.debug_level, tracker)
+        if tracker is not None:
+            tracker.pause()
+        return dict(item, spans=spans)
+
+    def _tokenize(self, item):
+        if item["content"] == "":
+            return dict(item, blocks=[])
+        tracker = item["tracker"]
+        if tracker is not None:
+            tracker.resume()
+        blocks = tokenize_content(item["content"], item["spans"], item["profile"], self.model_name,
+                                  self.debug_level, tracker)
+        # Drop the file text as early as possible; only the blocks go further
+        return {"path": item["path"], "blocks": blocks}
+
+    def run(self, file_paths: Iterable[str], sink: Optional[Callable] = None) -> Dict[str, List[Dict]]:
+        """Chunk every path; returns {path: final_chunks} (empty when a sink is given)."""
+        results = {}
+
+        def merge(item):
+            final_chunks = merge_with_overlap(item["blocks"]) if item["blocks"] else []
+            if sink is not None:
+                sink(item["path"], final_chunks)
+            else:
+                results[item["path"]] = final_chunks
+            return item
+
+        paths_q = queue.Queue(maxsize=self.queue_size)
+        read_q = queue.Queue(maxsize=self.queue_size)
+        parse_q = queue.Queue(maxsize=self.queue_size)
+        token_q = queue.Queue(maxsize=self.queue_size)
+
+        self._stages = [
+            _Stage("read", self._read, self.readers, paths_q, read_q, self.parsers),
+            _Stage("parse", self._parse, self.parsers, read_q, parse_q, self.tokenizers),
+            _Stage("tokenize", self._tokenize, self.tokenizers, parse_q, token_q, 1),
+            _Stage("merge", merge, 1, token_q, None, 0),
+        ]
+
+        started = time.perf_counter()
+        for stage in self._stages:
+            for thread in stage.threads:
+                thread.start()
+
+        try:
+            for path in file_paths:
+                paths_q.put({"path": str(path)})
+        finally:
+            for _ in range(self.readers):
+                paths_q.put(_DONE)
+
+        for stage in self._stages:
+            for thread in stage.threads:
+                thread.join()
+        self._wall_seconds = time.perf_counter() - started
+
+        if self.debug_level == "VERBOSE":
+            for name, s in self.stats().items():
+                print(f"[INFO] {name:8} workers={s['workers']} items={s['items']} "
+                      f"utilization={s['utilization']:.0%} queue_max={s['queue_max']}/{self.queue_size}")
+        return results
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Occupancy of each stage for the last run.
+        utilization is busy time / (wall time * workers); queue_max is the
+        deepest the stage's input queue got. A stage with high utilization and
+        a full input queue is the bottleneck.
+        """
+        report = {}
+        for stage in self._stages:
+            capacity = self._wall_seconds * stage.workers
+            report[stage.name] = {
+                "workers": stage.workers,
+                "items": stage.items,
+                "errors": stage.errors,
+                "busy_seconds": round(stage.busy_seconds, 3),
+                "utilization": stage.busy_seconds / capacity if capacity else 0.0,
+                "queue_max": stage.queue_max,
+            }
+        return report
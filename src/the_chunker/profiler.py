@@ -0,0 +1,202 @@
+"""
+Hot-path profiling for chunking runs.
+
+profile_files() chunks every file with per-stage timings (read, parse,
+tokenize, merge) and then re-runs the top-N slowest and top-N largest files
+under tracemalloc (and optionally cProfile) to capture peak memory and hot
+functions. The result is a ranked report of the files that made a run slow.
+
+The second pass bypasses the token-count cache, so its peak memory and
+hotspots include tokenization. A file that raises is recorded with an 'error'
+instead of aborting the run.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional
+
+from .chunking.budget import FileBudget
+from .chunking.dispatcher import parse_content, tokenize_content
+from .chunking.profiles import resolve_profile
+from .chunking.read_file_content import read_file_content
+from .chunking.token_cache import token_cache_disabled
+from .my_overlap_chunker import merge_with_overlap
+
+HOTSPOT_LINES = 10  # Functions kept per file from cProfile output
+
+
+def _fallback_reason(profile, content: str, spans, budget_events) -> Optional[str]:
+    # Budget degradations can happen in any stage, including a read that skipped the file
+    for event in budget_events:
+        if event["action"] in ("fallback", "skipped", "truncated"):
+            return f"{event['stage']} {event['action']}: {event['reason']}"
+    if not content or spans is not None or profile.reader is None:
+        return None
+    if profile.markup is not None:
+        return "no markup sections found"
+    if not profile.language.chunkable:
+        return "language not chunkable"
+    return "no tree-sitter blocks (or parser error)"
+
+
+def _run_file(file_path: str, model_name: str, debug_level: str, budget=None) -> Dict:
+    """Chunk one file stage by stage, timing each stage."""
+    profile = resolve_profile(file_path)
+    tracker = budget.start(file_path) if budget is not None else None
+    events_before = len(budget.events) if budget is not None else 0
+    stages = {}
+    content = ""
+    spans = None
+    blocks = []
+    final_chunks = []
+    error = None
+
+    stage = "read"
+    try:
+        started = time.perf_counter()
+        content = read_file_content(file_path, tracker, reader=profile.reader) if profile.reader else ""
+        stages["read"] = time.perf_counter() - started
+
+        if content:
+            stage = "parse"
+            started = time.perf_counter()
+            spans = parse_content(content, profile, debug_level, tracker)
+            stages["parse"] = time.perf_counter() - started
+
+            stage = "tokenize"
+            started = time.perf_counter()
+            blocks = tokenize_content(content, spans, profile, model_name, debug_level, tracker)
+            stages["tokenize"] = time.perf_counter() - started
+
+            stage = "merge"
+            started = time.perf_counter()
+            final_chunks = merge_with_overlap(blocks) if blocks else []
+            stages["merge"] = time.perf_counter() - started
+    except Exception as e:
+        # Pathological files are what the profiler is for; keep going
+        stages[stage] = time.perf_counter() - started
+        error = f"{stage}: {type(e).__name__}: {e}"
+        print(f"[ERROR] {file_path}: {error}")
+
+    budget_events = budget.events[events_before:] if budget is not None else []
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+
+    return {
+        "file": file_path,
+        "language": profile.markup or profile.language.name,
+        "size_bytes": size,
+        "total_seconds": sum(stages.values()),
+        "stages": stages,
+        "spans": len(spans) if spans is not None else 0,  # Matched tree-sitter spans / markup sections
+        "semantic_chunks": len(blocks),
+        "final_chunks": len(final_chunks),
+        "fallback_reason": _fallback_reason(profile, content, spans, budget_events),
+        "error": error,
+    }
+
+
+def _measure(file_path: str, model_name: str, debug_level: str, budget, use_cprofile: bool) -> Dict:
+    """Re-run one file under tracemalloc (and cProfile) and return the extra measurements."""
+    if budget is not None:
+        # Same limits, separate event log, so the re-run does not duplicate the caller's events
+        budget = FileBudget(budget.max_seconds, budget.max_bytes, budget.max_ast_bytes, budget.ast_share)
+    profiler = cProfile.Profile() if use_cprofile else None
+    tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        # Cached counts from the first pass would hide tokenization from the measurement
+        with token_cache_disabled():
+            _run_file(file_path, model_name, debug_level, budget)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        tracemalloc.stop()
+
+    measured = {"peak_memory_bytes": peak}
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(HOTSPOT_LINES)
+        measured["hotspots"] = out.getvalue()
+    return measured
+
+
+def profile_files(file_paths: Iterable[str], model_name: str = "Qwen/Qwen3-Embedding-8B", debug_level: str = "NONE",
+                  top_n: int = 20, use_cprofile: bool = False, budget=None,
+                  report_path: Optional[str] = None) -> List[Dict]:
+    """
+    Chunk every file with per-stage timings and return records ranked slowest first.
+
+    The top_n slowest and top_n largest files are re-run under tracemalloc
+    ('peak_memory_bytes') and, with use_cprofile, cProfile ('hotspots').
+    With report_path, a text report is written there and the raw records next
+    to it as JSON (report_path + '.json').
+    """
+    records = [_run_file(str(path), model_name, debug_level, budget) for path in file_paths]
+    records.sort(key=lambda r: r["total_seconds"], reverse=True)
+
+    slowest = records[:top_n]
+    largest = sorted(records, key=lambda r: r["size_bytes"], reverse=True)[:top_n]
+    for record in {id(r): r for r in slowest + largest}.values():
+        record.update(_measure(record["file"], model_name, debug_level, budget, use_cprofile))
+
+    if report_path:
+        write_report(records, report_path, top_n)
+    return records
+
+
+def profile_directory(directory: str, **kwargs) -> List[Dict]:
+    """profile_files() over every file under directory (hidden directories and symlinks skipped)."""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                paths.append(path)
+    return profile_files(paths, **kwargs)
+
+
+def write_report(records: List[Dict], report_path: str, top_n: int = 20) -> None:
+    """Write a ranked slow-file report (text) plus the raw records (JSON)."""
+    total = sum(r["total_seconds"] for r in records)
+    stage_totals = {}
+    for r in records:
+        for stage, seconds in r["stages"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+    lines = [
+        f"Files: {len(records)}   total chunking time: {total:.2f}s",
+        "Stage totals: " + ", ".join(f"{s}={t:.2f}s" for s, t in stage_totals.items()),
+        "",
+        f"Top {min(top_n, len(records))} slowest files:",
+        f"{'rank':>4} {'seconds':>8} {'read':>7} {'parse':>7} {'token':>7} {'merge':>7} "
+        f"{'size':>10} {'spans':>6} {'peak MB':>8}  language / file / fallback",
+    ]
+    for rank, r in enumerate(records[:top_n], start=1):
+        st = r["stages"]
+        peak = f"{r['peak_memory_bytes'] / 1e6:8.1f}" if "peak_memory_bytes" in r else f"{'-':>8}"
+        lines.append(
+            f"{rank:>4} {r['total_seconds']:8.3f} {st.get('read', 0):7.3f} {st.get('parse', 0):7.3f} "
+            f"{st.get('tokenize', 0):7.3f} {st.get('merge', 0):7.3f} {r['size_bytes']:>10} {r['spans']:>6} {peak}  "
+            f"{r['language']} {r['file']}" + (f"  [fallback: {r['fallback_reason']}]" if r["fallback_reason"] else "")
+            + (f"  [error: {r['error']}]" if r["error"] else "")
+        )
+
+    for r in records[:top_n]:
+        if "hotspots" in r:
+            lines += ["", f"--- cProfile: {r['file']} ---", r["hotspots"].rstrip()]
+
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    with open(report_path + ".json", "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
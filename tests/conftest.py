@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from the_chunker.chunking import token_cache, tokenizer
+
+
+class _WhitespaceTokenizer:
+    """Stand-in for a HuggingFace tokenizer: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.calls = 0
+        self.delay = 0.0  # Seconds per encode() call, to simulate a slow tokenizer
+
+    def encode(self, text, add_special_tokens=False):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return text.split()
+
+
+@pytest.fixture
+def stub_tokenizer(monkeypatch):
+    """Count tokens without downloading a model; each test gets a fresh in-memory token cache."""
+    stub = _WhitespaceTokenizer()
+    monkeypatch.setattr(tokenizer.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: stub)
+    saved = token_cache.get_token_cache()
+    monkeypatch.setattr(token_cache, "_cache", token_cache.TokenCountCache())
+    yield stub
+    token_cache._cache = saved
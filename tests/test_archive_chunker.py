@@ -0,0 +1,79 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from the_chunker import FileBudget, turn_archive_to_chunks
+from the_chunker.chunking import token_cache
+
+
+def _zip(path, members, compression=zipfile.ZIP_STORED):
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+    return path
+
+
+def _summary(results):
+    return [(r["member"], len(r["chunks"]), r.get("error") is not None) for r in results]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_zip_members_are_chunked_in_order(tmp_path, stub_tokenizer, workers):
+    path = _zip(tmp_path / "a.zip", {"a.log": "alpha beta", "img.bin": "skip", "b.log": "gamma"})
+    results = turn_archive_to_chunks(str(path), workers=workers)
+    assert _summary(results) == [("a.log", 1, False), ("b.log", 1, False)]
+    chunk = results[0]["chunks"][0]
+    assert (chunk["content"], chunk["archive"], chunk["member"]) == ("alpha beta", str(path), "a.log")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bad_crc_member_does_not_abort_archive(tmp_path, stub_tokenizer, workers):
+    path = _zip(tmp_path / "a.zip", {"a.log": "good one", "x.log": "CORRUPTME", "z.log": "good two"})
+    raw = path.read_bytes()
+    path.write_bytes(raw.replace(b"CORRUPTME", b"CORRUPTED"))
+    results = turn_archive_to_chunks(str(path), workers=workers)
+    assert _summary(results) == [("a.log", 1, False), ("x.log", 0, True), ("z.log", 1, False)]
+    assert "CRC" in results[1]["error"]
+
+
+def test_encrypted_member_does_not_abort_archive(tmp_path, stub_tokenizer):
+    path = _zip(tmp_path / "a.zip", {"a.log": "good", "secret.log": "hidden"})
+    raw = bytearray(path.read_bytes())
+    # Set the 'encrypted' flag of secret.log in the central directory
+    central = raw.rfind(b"PK\x01\x02")
+    raw[central + 8] |= 0x1
+    path.write_bytes(bytes(raw))
+    results = turn_archive_to_chunks(str(path))
+    assert _summary(results) == [("a.log", 1, False), ("secret.log", 0, True)]
+
+
+def test_truncated_tar_keeps_earlier_members(tmp_path, stub_tokenizer):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        for name, text in [("a.log", b"first member"), ("b.log", b"x " * 50_000)]:
+            info = tarfile.TarInfo(name)
+            info.size = len(text)
+            tf.addfile(info, io.BytesIO(text))
+    path = tmp_path / "a.tar.gz"
+    path.write_bytes(buf.getvalue()[:len(buf.getvalue()) // 2])
+    results = turn_archive_to_chunks(str(path))
+    assert results[0]["member"] == "a.log" and results[0]["chunks"]
+    assert results[-1]["error"] is not None
+
+
+def test_max_bytes_bounds_member_reads(tmp_path, stub_tokenizer):
+    path = _zip(tmp_path / "a.zip", {"big.log": "y" * 1_000_000, "small.log": "ok"}, zipfile.ZIP_DEFLATED)
+    budget = FileBudget(max_bytes=100)
+    results = turn_archive_to_chunks(str(path), budget=budget)
+    assert len(results[0]["chunks"][0]["content"]) == 100
+    assert [(e["file"], e["action"]) for e in budget.events] == [("big.log", "truncated")]
+
+
+def test_serial_path_does_not_flush_per_member(tmp_path, stub_tokenizer, monkeypatch):
+    path = _zip(tmp_path / "a.zip", {"a.log": "one", "b.log": "two"})
+    flushes = []
+    monkeypatch.setattr(token_cache.get_token_cache(), "flush", lambda: flushes.append(1))
+    turn_archive_to_chunks(str(path))
+    assert flushes == []
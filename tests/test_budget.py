@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+from the_chunker import FileBudget
+from the_chunker.chunking import BudgetExceeded
+from the_chunker.chunking.markup_chunker import tokenize_markup_spans
+from the_chunker.chunking.tree_chunker import tokenize_code_spans
+
+HUGE = " ".join(f"w{i}" for i in range(50_000))  # Far over the span limit; many distinct fallback pieces
+
+
+def test_oversized_markup_span_stops_at_deadline(stub_tokenizer):
+    stub_tokenizer.delay = 0.01
+    budget = FileBudget(max_seconds=0.2)
+    tracker = budget.start("dump.md")
+    started = time.monotonic()
+    chunks = tokenize_markup_spans([{"content": HUGE, "heading_path": ["A"], "kind": "text"}],
+                                   "m", "NONE", tracker)
+    assert time.monotonic() - started < 1.0
+    assert chunks and all(chunk["heading_path"] == ["A"] for chunk in chunks)
+    assert ("markup", "truncated") in [(e["stage"], e["action"]) for e in budget.events]
+
+
+def test_oversized_code_span_stops_at_ast_deadline(stub_tokenizer):
+    stub_tokenizer.delay = 0.01
+    budget = FileBudget(max_seconds=0.4, ast_share=0.5)
+    tracker = budget.start("dump.sql")
+    started = time.monotonic()
+    with pytest.raises(BudgetExceeded):
+        tokenize_code_spans([("insert_statement", HUGE)], "m", "NONE", tracker)
+    assert time.monotonic() - started < 1.0
+    assert [(e["stage"], e["action"]) for e in budget.events] == [("ast", "truncated")]
+
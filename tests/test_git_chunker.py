@@ -0,0 +1,104 @@
+import os
+import subprocess
+
+import pytest
+
+from the_chunker import FileBudget, turn_git_diff_to_chunks
+from the_chunker.git_chunker import diff_blobs, read_blobs
+
+GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@t", GIT_COMMITTER_NAME="t",
+               GIT_COMMITTER_EMAIL="t@t")
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True,
+                          env=GIT_ENV).stdout.decode().strip()
+
+
+def _commit(repo, files=(), removed=()):
+    for name, text in dict(files).items():
+        (repo / name).write_text(text)
+    for name in removed:
+        (repo / name).unlink()
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "change")
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    return tmp_path
+
+
+def _by_path(entries):
+    return {entry["path"]: entry for entry in entries}
+
+
+def test_add_modify_delete_rename(repo, stub_tokenizer):
+    first = _commit(repo, {"keep.log": "unchanged text", "edit.log": "old words", "gone.log": "bye",
+                           "old_name.log": "moved content"})
+    os.rename(repo / "old_name.log", repo / "new_name.log")
+    second = _commit(repo, {"edit.log": "new words here", "added.log": "fresh file"}, removed=["gone.log"])
+
+    report = turn_git_diff_to_chunks(str(repo), first, second)
+    changed = _by_path(report["changed"])
+    assert {path: entry["status"] for path, entry in changed.items()} == {
+        "added.log": "A", "edit.log": "M", "new_name.log": "A",
+    }
+    assert _by_path(report["deleted"]).keys() == {"gone.log", "old_name.log"}
+    assert report["skipped"] == []
+    chunk = changed["edit.log"]["chunks"][0]
+    assert chunk["content"] == "new words here"
+    assert chunk["path"] == "edit.log" and chunk["blob"] == changed["edit.log"]["blob"]
+
+
+def test_seen_blob_is_reused_per_routing(repo, stub_tokenizer):
+    first = _commit(repo, {"a.log": "shared content"})
+    seen = set()
+    turn_git_diff_to_chunks(str(repo), _git(repo, "hash-object", "-t", "tree", "/dev/null"), first,
+                            seen_blobs=seen)
+    assert len(seen) == 1
+
+    os.rename(repo / "a.log", repo / "b.log")
+    second = _commit(repo, {"notes.md": "shared content"})
+    report = turn_git_diff_to_chunks(str(repo), first, second, seen_blobs=seen)
+    changed = _by_path(report["changed"])
+    assert changed["b.log"]["chunks"] is None          # Same blob, same routing: reuse
+    assert changed["notes.md"]["chunks"]               # Same blob, markdown routing: chunked again
+    assert changed["b.log"]["blob"] == changed["notes.md"]["blob"]
+    assert _by_path(report["deleted"]).keys() == {"a.log"}
+    assert len(seen) == 2
+
+
+def test_max_bytes_truncates_blob(repo, stub_tokenizer):
+    first = _commit(repo, {"small.log": "x"})
+    second = _commit(repo, {"big.log": "word " * 1000})
+    budget = FileBudget(max_bytes=50)
+    report = turn_git_diff_to_chunks(str(repo), first, second, budget=budget)
+    content = report["changed"][0]["chunks"][0]["content"]
+    assert len(content) == 50
+    assert [(e["file"], e["action"]) for e in budget.events] == [("big.log", "truncated")]
+
+
+def test_read_blobs_keeps_framing_when_truncating(repo):
+    first = _commit(repo, {"a.log": "a" * 100, "b.log": "b" * 10})
+    blobs = [_git(repo, "rev-parse", f"{first}:{name}") for name in ("a.log", "b.log")]
+    assert [data for _, data in read_blobs(str(repo), blobs, max_bytes=5)] == [b"a" * 6, b"b" * 6]
+    assert [data for _, data in read_blobs(str(repo), blobs + ["0" * 40])] == [b"a" * 100, b"b" * 10]
+
+
+def test_paths_with_spaces_and_unicode(repo):
+    first = _commit(repo, {"plain.log": "x"})
+    second = _commit(repo, {"with space ü.log": "y"})
+    assert [c["path"] for c in diff_blobs(str(repo), first, second)] == ["with space ü.log"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_symlinks_are_reported_as_skipped(repo, stub_tokenizer):
+    first = _commit(repo, {"target.log": "x"})
+    os.symlink("target.log", repo / "link.log")
+    second = _commit(repo)
+    report = turn_git_diff_to_chunks(str(repo), first, second)
+    assert report["changed"] == []
+    assert [(e["path"], e["reason"]) for e in report["skipped"]] == [("link.log", "symlink")]
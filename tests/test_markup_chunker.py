@@ -0,0 +1,87 @@
+from the_chunker.chunking.markup_chunker import split_html, split_markdown, split_markup
+
+
+def _paths(spans):
+    return [(span["kind"], span["heading_path"]) for span in spans]
+
+
+def test_atx_headings_nest_and_reset():
+    spans = split_markdown("# A\nintro\n## B ##\nmore\n### C\ndeep\n# D\nend\n")
+    assert _paths(spans) == [
+        ("text", ["A"]),
+        ("text", ["A", "B"]),
+        ("text", ["A", "B", "C"]),
+        ("text", ["D"]),
+    ]
+    assert spans[1]["content"] == "## B ##\nmore\n"
+
+
+def test_setext_headings():
+    spans = split_markdown("Title\n=====\nbody\n\nSub\n---\nx\n")
+    assert _paths(spans) == [("text", ["Title"]), ("text", ["Title", "Sub"])]
+    assert spans[1]["content"].startswith("Sub\n---\n")
+
+
+def test_dash_rule_after_list_item_is_not_a_heading():
+    spans = split_markdown("- item\n---\nafter\n")
+    assert _paths(spans) == [("text", [])]
+
+
+def test_front_matter_is_its_own_span():
+    spans = split_markdown("---\ntitle: x\n---\n# A\nbody\n")
+    assert _paths(spans) == [("front_matter", []), ("text", ["A"])]
+    assert spans[0]["content"] == "---\ntitle: x\n---\n"
+
+
+def test_unclosed_front_matter_is_plain_text():
+    spans = split_markdown("---\ntitle: x\n")
+    assert _paths(spans) == [("text", [])]
+
+
+def test_nested_fences_stay_one_code_block():
+    source = "# A\n````md\n```py\n# not a heading\n```\n````\nafter\n"
+    spans = split_markdown(source)
+    assert _paths(spans) == [("text", ["A"]), ("code", ["A"]), ("text", ["A"])]
+    assert spans[1]["content"] == "````md\n```py\n# not a heading\n```\n````\n"
+
+
+def test_tilde_fence_is_not_closed_by_backticks():
+    spans = split_markdown("~~~\n```\n~~~\n")
+    assert _paths(spans) == [("code", [])]
+
+
+def test_unclosed_fence_runs_to_end():
+    spans = split_markdown("# A\ntext\n```py\ncode\n# comment\n")
+    assert _paths(spans) == [("text", ["A"]), ("code", ["A"])]
+    assert spans[1]["content"] == "```py\ncode\n# comment\n"
+
+
+def test_html_heading_nesting():
+    spans = split_html("<h1>A</h1><p>x</p><h2>B</h2><p>y</p><h3>C</h3><p>z</p><h2>D</h2><p>w</p>")
+    assert _paths(spans) == [
+        ("text", ["A"]),
+        ("text", ["A", "B"]),
+        ("text", ["A", "B", "C"]),
+        ("text", ["A", "D"]),
+    ]
+    assert spans[0]["content"].split() == ["A", "x"]
+
+
+def test_html_pre_is_a_code_span():
+    spans = split_html("<h1>A</h1><p>before</p><pre>def f():\n    return <b>1</b>\n</pre><p>after</p>")
+    assert _paths(spans) == [("text", ["A"]), ("code", ["A"]), ("text", ["A"])]
+    assert spans[1]["content"] == "def f():\n    return 1\n"
+
+
+def test_html_script_and_style_are_dropped():
+    spans = split_html("<style>h1 { color: red }</style><h1>A</h1>"
+                       "<script>var s = '<h2>fake</h2>';</script><p>text</p>")
+    assert _paths(spans) == [("text", ["A"])]
+    assert "fake" not in spans[0]["content"]
+    assert "color" not in spans[0]["content"]
+
+
+def test_split_markup_dispatch():
+    assert _paths(split_markup("# A\n", "markdown")) == [("text", ["A"])]
+    assert _paths(split_markup("<h1>A</h1>", "html")) == [("text", ["A"])]
+    assert _paths(split_markup("<doc><h1>A</h1></doc>", "xml")) == [("text", ["A"])]
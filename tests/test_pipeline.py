@@ -0,0 +1,62 @@
+import time
+
+from the_chunker import ChunkingPipeline, FileBudget
+from the_chunker.chunking import chunk_file
+from the_chunker.my_overlap_chunker import merge_with_overlap
+
+
+def test_pause_excludes_waiting_time():
+    tracker = FileBudget(max_seconds=0.1).start("a.log")
+    tracker.pause()
+    time.sleep(0.2)
+    tracker.resume()
+    assert not tracker.expired()
+    time.sleep(0.15)
+    assert tracker.expired()
+
+
+def test_output_matches_chunk_file(tmp_path, stub_tokenizer):
+    files = {
+        "a.py": "def f():\n    return 1\n\n\nclass C:\n    pass\n",
+        "b.md": "# Title\nintro\n\n## Part\nmore text\n```py\ncode()\n```\n",
+        "c.log": " ".join(f"line{i}" for i in range(3000)),
+        "d.bin": "not routed",
+        "e.log": "",
+    }
+    paths = []
+    for name, text in files.items():
+        (tmp_path / name).write_text(text)
+        paths.append(str(tmp_path / name))
+
+    results = ChunkingPipeline("m", readers=2, parsers=2, tokenizers=2, queue_size=2).run(paths)
+    expected = {}
+    for path in paths:
+        blocks = chunk_file(path, "m", "NONE")
+        expected[path] = merge_with_overlap(blocks) if blocks else []
+    assert results == expected
+
+
+def test_sink_receives_every_path(tmp_path, stub_tokenizer):
+    paths = []
+    for i in range(5):
+        (tmp_path / f"{i}.log").write_text(f"file number {i}")
+        paths.append(str(tmp_path / f"{i}.log"))
+    received = {}
+    results = ChunkingPipeline("m").run(paths, sink=lambda path, chunks: received.__setitem__(path, chunks))
+    assert results == {}
+    assert sorted(received) == sorted(paths)
+
+
+def test_queue_wait_does_not_count_against_budget(tmp_path, stub_tokenizer):
+    # Each file takes ~50 ms of tokenizer time; with one tokenizer thread the
+    # last files wait far longer than max_seconds in the queue.
+    stub_tokenizer.delay = 0.05
+    paths = []
+    for i in range(20):
+        (tmp_path / f"{i}.log").write_text(f"small file {i}")
+        paths.append(str(tmp_path / f"{i}.log"))
+
+    budget = FileBudget(max_seconds=0.3)
+    results = ChunkingPipeline("m", readers=4, parsers=1, tokenizers=1, budget=budget).run(paths)
+    assert [path for path, chunks in results.items() if not chunks] == []
+    assert budget.events == []
@@ -0,0 +1,63 @@
+import json
+
+from the_chunker import FileBudget, profile_files
+from the_chunker import profiler
+from the_chunker.chunking.profiles import resolve_profile
+
+
+def test_records_and_report(tmp_path, stub_tokenizer):
+    small = tmp_path / "small.log"
+    small.write_text("a few words")
+    doc = tmp_path / "notes.md"
+    doc.write_text("# A\ntext\n## B\nmore\n")
+    report = tmp_path / "report.txt"
+
+    records = profile_files([str(small), str(doc)], model_name="m", top_n=1, report_path=str(report))
+    by_file = {r["file"]: r for r in records}
+    assert by_file[str(doc)]["spans"] == 2
+    assert by_file[str(doc)]["fallback_reason"] is None
+    assert by_file[str(small)]["error"] is None
+    assert all("peak_memory_bytes" in r for r in records)  # Top-1 slowest and top-1 largest
+    assert "spans" in report.read_text()
+    assert len(json.loads((tmp_path / "report.txt.json").read_text())) == 2
+
+
+def test_skipped_binary_document_keeps_its_reason(tmp_path, stub_tokenizer, monkeypatch):
+    pdf = tmp_path / "big.pdf"
+    pdf.write_bytes(b"%PDF" + b"x" * 100)
+    # Route .pdf to a reader even when PyPDF2 is not installed
+    monkeypatch.setattr(profiler, "resolve_profile", _with_reader)
+    budget = FileBudget(max_bytes=10)
+    [record] = profile_files([str(pdf)], model_name="m", budget=budget)
+    assert record["fallback_reason"] == "read skipped: file larger than 10 bytes"
+
+
+def _with_reader(path):
+    return resolve_profile(path)._replace(reader=lambda data, tracker=None: "text")
+
+
+def test_failing_file_is_recorded_not_raised(tmp_path, stub_tokenizer, monkeypatch):
+    good = tmp_path / "good.log"
+    good.write_text("fine")
+    bad = tmp_path / "bad.log"
+    bad.write_text("boom")
+    original = profiler.tokenize_content
+
+    def tokenize(content, *args):
+        if content == "boom":
+            raise ValueError("bad input")
+        return original(content, *args)
+
+    monkeypatch.setattr(profiler, "tokenize_content", tokenize)
+    records = {r["file"]: r for r in profile_files([str(good), str(bad)], model_name="m")}
+    assert records[str(good)]["error"] is None
+    assert records[str(bad)]["error"] == "tokenize: ValueError: bad input"
+    assert set(records[str(bad)]["stages"]) == {"read", "parse", "tokenize"}
+
+
+def test_measured_pass_bypasses_token_cache(tmp_path, stub_tokenizer):
+    path = tmp_path / "a.log"
+    path.write_text("some words to count")
+    profile_files([str(path)], model_name="m", top_n=1)
+    # First pass tokenizes; the measured re-run must tokenize again instead of hitting the cache
+    assert stub_tokenizer.calls == 2
@@ -0,0 +1,60 @@
+import zipfile
+
+import pytest
+
+from the_chunker import turn_archive_to_chunks
+from the_chunker.chunking import chunk_file, map_extension, override_language, profiles, resolve_profile
+from the_chunker.chunking.chunker_config import EXT_TO_LANG, get_language_from_extension, is_chunkable
+from the_chunker.chunking.read_file_content import is_readable_name, read_bytes_content, read_file_content
+
+
+@pytest.fixture(autouse=True)
+def restore_routing(monkeypatch):
+    """map_extension()/override_language() replace module globals; undo them after each test."""
+    for name in ("_languages", "_files", "_ext_to_lang"):
+        monkeypatch.setattr(profiles, name, getattr(profiles, name))
+
+
+def test_profiles_match_config_tables():
+    for key in EXT_TO_LANG:
+        path = key if not key.startswith(".") else f"file{key}"
+        language = get_language_from_extension(path)
+        profile = resolve_profile(path)
+        assert profile.language.name == language
+        assert profile.language.chunkable == is_chunkable(language)
+
+
+def test_unknown_extension_has_no_reader():
+    assert resolve_profile("x.unknownext").reader is None
+    assert not is_readable_name("x.unknownext")
+
+
+def test_map_extension_is_seen_by_every_reader(tmp_path, stub_tokenizer):
+    map_extension(".foo", "python")
+    assert resolve_profile("a.foo").language.name == "python"
+    assert is_readable_name("dir/a.foo")
+
+    path = tmp_path / "q.foo"
+    path.write_text("x = 1\n")
+    assert read_file_content(path) == "x = 1\n"
+    assert read_bytes_content(b"y = 2\n", "q.foo") == "y = 2\n"
+    assert chunk_file(str(path), "m", "NONE")
+
+    archive = tmp_path / "a.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.foo", "z = 3\n")
+    assert [r["member"] for r in turn_archive_to_chunks(str(archive))] == ["a.foo"]
+
+
+def test_map_exact_file_name():
+    profile = map_extension("Jenkinsfile", "default")
+    assert profile.reader is not None
+    assert resolve_profile("ci/Jenkinsfile") is profile
+    assert is_readable_name("ci/Jenkinsfile")
+
+
+def test_override_language_rebuilds_file_profiles():
+    override_language("python", node_types={"function_definition"}, max_span_tokens=123)
+    profile = resolve_profile("a.py")
+    assert profile.language.node_types == frozenset({"function_definition"})
+    assert profile.language.max_span_tokens == 123
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from the_chunker.chunking import token_cache
+from the_chunker.chunking.token_cache import TokenCountCache, token_cache_disabled
+from the_chunker.chunking.tokenizer import count_tokens
+
+
+def _rows(path):
+    with closing(sqlite3.connect(path)) as conn:
+        if not conn.execute("SELECT name FROM sqlite_master WHERE name = 'token_counts'").fetchone():
+            return {}
+        return {(model, digest): tokens for model, digest, tokens in
+                conn.execute("SELECT model, hash, tokens FROM token_counts")}
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TokenCountCache(max_entries=2)
+    cache.put("a", "m", 1)
+    cache.put("b", "m", 2)
+    assert cache.get("a", "m") == 1  # 'b' is now the oldest
+    cache.put("c", "m", 3)
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == 1
+    assert cache.get("c", "m") == 3
+
+
+def test_counts_are_per_model():
+    cache = TokenCountCache()
+    cache.put("text", "model-a", 1)
+    assert cache.get("text", "model-b") is None
+
+
+def test_hit_rate_accounting(tmp_path):
+    cache = TokenCountCache(max_entries=1, disk_path=str(tmp_path / "tokens.db"))
+    assert cache.get("a", "m") is None      # miss
+    cache.put("a", "m", 1)
+    assert cache.get("a", "m") == 1         # memory hit
+    cache.put("b", "m", 2)                  # evicts 'a' from memory, still pending
+    assert cache.get("a", "m") == 1         # pending: in-process hit, not a disk hit
+    cache.flush()
+    cache.clear()
+    assert cache.get("b", "m") == 2         # disk hit
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (0, 1, 0)
+    cache.close()
+
+
+def test_disk_round_trip(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    writer = TokenCountCache(disk_path=path)
+    writer.put("hello world", "m", 2)
+    writer.close()
+
+    reader = TokenCountCache(disk_path=path)
+    assert reader.get("hello world", "m") == 2
+    assert reader.stats()["disk_hits"] == 1
+    reader.close()
+
+
+def test_pending_writes_flush_on_age(tmp_path, monkeypatch):
+    path = str(tmp_path / "tokens.db")
+    cache = TokenCountCache(disk_path=path)
+    cache.put("a", "m", 1)
+    assert _rows(path) == {}
+    monkeypatch.setattr(token_cache, "DISK_FLUSH_SECONDS", 0.0)
+    cache.put("b", "m", 2)
+    assert len(_rows(path)) == 2
+    cache.close()
+
+
+def _put_in_child(cache, result_queue):
+    cache.put("from child", "m", 7)
+    cache.flush()  # Pool workers exit without atexit; flush explicitly
+    result_queue.put(cache._conn_pid == os.getpid())
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_uses_its_own_connection(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    cache = TokenCountCache(disk_path=path)
+    cache.put("from parent", "m", 3)  # Pending in the parent, opens its connection
+    cache.flush()
+    cache.put("pending in parent", "m", 4)
+
+    ctx = multiprocessing.get_context("fork")
+    result_queue = ctx.Queue()
+    child = ctx.Process(target=_put_in_child, args=(cache, result_queue))
+    child.start()
+    reopened = result_queue.get(timeout=10)
+    child.join()
+    assert child.exitcode == 0
+    assert reopened  # The child opened its own connection instead of the parent's
+
+    rows = _rows(path)
+    assert sorted(rows.values()) == [3, 7]  # Parent's pending write was left to the parent
+    cache.close()
+    assert sorted(_rows(path).values()) == [3, 4, 7]
+
+
+def test_count_tokens_uses_cache(stub_tokenizer):
+    assert count_tokens("one two three", "m") == 3
+    assert count_tokens("one two three", "m") == 3
+    assert stub_tokenizer.calls == 1
+
+
+def test_token_cache_disabled_bypasses_and_restores(stub_tokenizer):
+    cache = token_cache.get_token_cache()
+    count_tokens("one two", "m")
+    with token_cache_disabled():
+        assert token_cache.get_token_cache() is None
+        count_tokens("one two", "m")
+    assert token_cache.get_token_cache() is cache
+    assert stub_tokenizer.calls == 2